@@ -1,12 +1,92 @@
 import socket
 import simplefix
 import logging
+import logging.handlers
+import queue
+import atexit
 import time
 import threading
 import configparser
 import json
 import os
-from datetime import datetime
+import select
+from dataclasses import dataclass
+
+_decode = bytes.decode
+_PIPE_TO_SOH = bytes.maketrans(b'|', b'\x01')
+
+_MSG_TYPES = {
+    '0': 'Heartbeat',
+    '1': 'TestRequest',
+    '2': 'ResendRequest',
+    '3': 'Reject',
+    '4': 'SequenceReset',
+    '5': 'Logout',
+    'A': 'Logon',
+    'D': 'NewOrderSingle',
+    'F': 'OrderCancelRequest',
+    'G': 'OrderCancelReplaceRequest',
+    '8': 'ExecutionReport',
+    '9': 'OrderCancelReject'
+}
+# Accept raw bytes from the parser as well as str
+_MSG_TYPES.update({msg_type.encode(): desc for msg_type, desc in list(_MSG_TYPES.items())})
+
+@dataclass(frozen=True, slots=True)
+class FixConfig:
+    """Connection settings from the DEFAULT section of sendfix.cfg"""
+    HOST: str
+    PORT: int
+    FIX_VERSION: str
+    SENDERCOMPID: str
+    TARGETCOMPID: str
+    HEARTBEAT: str
+
+_config_cache = {}
+
+def load_fix_config(path='sendfix.cfg'):
+    """Parse the client config once per process and share it across FixClient instances"""
+    cfg = _config_cache.get(path)
+    if cfg is None:
+        config = configparser.ConfigParser()
+        config.read(path)
+        try:
+            cfg = FixConfig(
+                HOST=config['DEFAULT']['ServerIP'],
+                PORT=int(config['DEFAULT']['Port']),
+                FIX_VERSION=config['DEFAULT']['FixVersion'],
+                SENDERCOMPID=config['DEFAULT']['SenderCompId'],
+                TARGETCOMPID=config['DEFAULT']['TargetCompId'],
+                HEARTBEAT=config['DEFAULT']['HeartbeatInterval'],
+            )
+        except Exception as e:
+            raise Exception(f"Invalid configuration: {e}")
+        _config_cache[path] = cfg
+    return cfg
+
+_log_listener = None
+
+def _get_log_queue():
+    """Start the shared background writer for sendfix.log once per process"""
+    global _log_listener
+    if _log_listener is None:
+        file_handler = logging.FileHandler('sendfix.log')
+        file_handler.setFormatter(logging.Formatter(
+            '%(asctime)s.%(msecs)03d %(levelname)s %(module)s - %(funcName)s: %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S',
+        ))
+        _log_listener = logging.handlers.QueueListener(queue.SimpleQueue(), file_handler)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+    return _log_listener.queue
+
+def _format_pairs(pairs):
+    """Render (tag, value) byte pairs in wire order as tag=value|tag=value"""
+    return b"|".join(tag + b"=" + value for tag, value in pairs).decode()
+
+def _to_dict(message):
+    """Index a parsed message's fields by integer tag in a single pass"""
+    return {int(tag): value for tag, value in message.pairs}
 
 class FixClient:
     def __init__(self, message_callback=None):
@@ -16,37 +96,51 @@ class FixClient:
         self.init_variables()
         self.sock = None
         self.running = False
+        self.RECV_BUFFER_SIZE = 65536
+        self.ORDER_BATCH_BYTES = 65536
+        self.SOCKET_BUFFER_SIZE = 1 << 20
         
     def setup_logging(self):
-        logging.basicConfig(
-            filename='sendfix.log',
-            level=logging.DEBUG,
-            format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s - %(funcName)s: %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-        )
+        # Network threads only enqueue records; a listener thread does the file I/O
         self.logger = logging.getLogger(__name__)
+        # SENDFIX_LOG_LEVEL, as in quickfix_client; INFO skips the byte-level send diagnostics
+        level_name = os.environ.get('SENDFIX_LOG_LEVEL', 'DEBUG').upper()
+        level = logging.getLevelName(level_name)
+        valid_level = isinstance(level, int)
+        self.logger.setLevel(level if valid_level else logging.DEBUG)
+        self.logger.propagate = False
+        if not any(isinstance(h, logging.handlers.QueueHandler) for h in self.logger.handlers):
+            self.logger.addHandler(logging.handlers.QueueHandler(_get_log_queue()))
+        if not valid_level:
+            self.logger.warning(f"Invalid SENDFIX_LOG_LEVEL {level_name!r}, using DEBUG")
         
     def load_config(self):
-        config = configparser.ConfigParser()
-        config.read('sendfix.cfg')
-        if 'DEFAULT' in config:
-            try:
-                self.HOST = config['DEFAULT']['ServerIP']
-                self.PORT = int(config['DEFAULT']['Port'])
-                self.FIX_VERSION = config['DEFAULT']['FixVersion']
-                self.SENDERCOMPID = config['DEFAULT']['SenderCompId']
-                self.TARGETCOMPID = config['DEFAULT']['TargetCompId']
-                self.HEARTBEAT = config['DEFAULT']['HeartbeatInterval']
-            except Exception as e:
-                raise Exception(f"Invalid configuration: {e}")
+        self.cfg = load_fix_config()
+        self.HOST = self.cfg.HOST
+        self.PORT = self.cfg.PORT
+        self.FIX_VERSION = self.cfg.FIX_VERSION
+        self.SENDERCOMPID = self.cfg.SENDERCOMPID
+        self.TARGETCOMPID = self.cfg.TARGETCOMPID
+        self.HEARTBEAT = self.cfg.HEARTBEAT
                 
     def init_variables(self):
         self.seq = 0
         self.incoming_seq = 0
         self.order_counter = 0
+        self._clordid_sec = None
+        self._clordid_prefix = ''
+        self._utc_sec = None
+        self._utc_ts = b''
         self.sent_messages = {}
         self.expected_seq = 1
         self.SESSION_FILE = 'session_state.json'
+        self.SESSION_FLUSH_INTERVAL = 1.0  # seconds between debounced state writes
+        self._dirty_seq = False
+        self._defer_flush = False
+        self._flush_timer = None
+        self._state_lock = threading.Lock()
+        # Held across sequence assignment and the socket write so seq numbers stay monotonic on the wire
+        self._send_lock = threading.RLock()
         self.load_session_state()
         
     def log_message(self, message):
@@ -57,7 +151,14 @@ class FixClient:
     def connect(self):
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Larger kernel buffers absorb order bursts; set before connect so the window scales
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.SOCKET_BUFFER_SIZE)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.SOCKET_BUFFER_SIZE)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
             self.sock.connect((self.HOST, self.PORT))
+            # FIX messages are small and latency sensitive - don't let Nagle hold them back
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.build_header_templates()
             self.running = True
             self.log_message(f"Connected to {self.HOST}:{self.PORT}")
             
@@ -74,6 +175,7 @@ class FixClient:
             
     def disconnect(self):
         self.running = False
+        self.flush_session_state()
         if self.sock:
             self.sock.close()
         self.log_message("Disconnected")
@@ -97,70 +199,109 @@ class FixClient:
                 'sender_comp_id': self.SENDERCOMPID,
                 'target_comp_id': self.TARGETCOMPID
             }
-            with open(self.SESSION_FILE, 'w') as f:
-                json.dump(state, f, indent=2)
+            # Write to a temp file and rename so a crash never leaves a torn state file
+            tmp_file = self.SESSION_FILE + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(json.dumps(state, separators=(',', ':')).encode())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.SESSION_FILE)
         except Exception as e:
             self.log_message(f"Error saving session state: {e}")
             
+    def flush_session_state(self):
+        """Persist session state now if sequence numbers changed since the last write"""
+        with self._state_lock:
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty_seq:
+                return
+            self._dirty_seq = False
+            self.save_session_state()
+        
+    def schedule_session_flush(self):
+        """Debounce state writes - at most one write per SESSION_FLUSH_INTERVAL"""
+        with self._state_lock:
+            if self._flush_timer or self._defer_flush:
+                return
+            self._flush_timer = threading.Timer(self.SESSION_FLUSH_INTERVAL, self.flush_session_state)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+            
     def increment_seq(self):
         self.seq += 1
-        self.save_session_state()
+        self._dirty_seq = True
+        self.schedule_session_flush()
         return self.seq
         
-    def send_logon(self):
-        logon_message = simplefix.FixMessage()
-        logon_message.append_pair(8, self.FIX_VERSION)
-        logon_message.append_pair(35, "A")
-        logon_message.append_pair(49, self.SENDERCOMPID)
-        logon_message.append_pair(56, self.TARGETCOMPID)
-        logon_message.append_pair(34, self.increment_seq())
-        logon_message.append_utc_timestamp(52, precision=0)
-        logon_message.append_pair(98, "0")
-        logon_message.append_pair(108, self.HEARTBEAT)
+    def build_header_templates(self):
+        """Pre-encode the static header bytes shared by all session-level messages"""
+        # Bytes values skip simplefix's per-append str encoding in construct_message
+        self._FIX_VERSION_B = self.FIX_VERSION.encode()
+        self._SENDER_B = self.SENDERCOMPID.encode()
+        self._TARGET_B = self.TARGETCOMPID.encode()
+        self._begin_string_b = f"8={self.FIX_VERSION}\x01".encode()
+        self._comp_ids_b = f"\x0149={self.SENDERCOMPID}\x0156={self.TARGETCOMPID}\x0134=".encode()
         
-        encoded_msg = logon_message.encode()
+    def utc_timestamp(self):
+        """UTC timestamp at second precision, reformatted only when the second rolls over"""
+        now = int(time.time())
+        if now != self._utc_sec:
+            self._utc_sec = now
+            self._utc_ts = time.strftime("%Y%m%d-%H:%M:%S", time.gmtime(now)).encode()
+        return self._utc_ts
         
-        # Debug: Log the raw encoded message
-        self.log_message(f"Raw encoded logon: {encoded_msg}")
+    def encode_session_message(self, msg_type, seq, body=b""):
+        """Encode a message straight from the pre-built header template, bypassing simplefix"""
+        payload = b"35=" + msg_type + self._comp_ids_b + b"%d\x0152=%s\x01" % (seq, self.utc_timestamp()) + body
+        encoded_msg = self._begin_string_b + b"9=%d\x01" % len(payload) + payload
+        return encoded_msg + b"10=%03d\x01" % (sum(encoded_msg) % 256)
         
-        self.sock.sendall(encoded_msg)
+    def _send(self, encoded_msg):
+        """Single write point to the socket - serialized so concurrent senders never interleave bytes"""
+        with self._send_lock:
+            self.sock.sendall(encoded_msg)
+            
+    def send_logon(self):
+        body = f"98=0\x01108={self.HEARTBEAT}\x01".encode()
+        with self._send_lock:
+            encoded_msg = self.encode_session_message(b"A", self.increment_seq(), body)
+            self._send(encoded_msg)
         
-        # Log the formatted outgoing message
-        formatted_msg = self.format_outgoing_message(logon_message)
-        self.log_message(f"Sent Logon: {formatted_msg}")
+        # Debug: Log the raw encoded message
+        self.log_message(f"Raw encoded logon: {encoded_msg}")
         
-        # Debug: Check if checksum is in the message
-        if logon_message.get(10):
-            self.log_message(f"Checksum found: {logon_message.get(10)}")
-        else:
-            self.log_message("WARNING: No checksum (tag 10) found in message!")
+        self.log_outgoing("Logon", encoded_msg)
         
     def send_logout(self):
         logout_message = simplefix.FixMessage()
-        self.construct_message("5", logout_message)
-        logout_message.remove("60")
-        
-        encoded_msg = logout_message.encode()
-        self.sock.sendall(encoded_msg)
+        with self._send_lock:
+            self.construct_message("5", logout_message)
+            logout_message.remove("60")
+            
+            encoded_msg = logout_message.encode()
+            self._send(encoded_msg)
         
-        # Log the formatted outgoing message
-        formatted_msg = self.format_outgoing_message(logout_message)
-        self.log_message(f"Sent Logout: {formatted_msg}")
+        self.log_outgoing("Logout", encoded_msg, logout_message)
         self.disconnect()
         
     def construct_message(self, msg_type, message):
         current_seq = self.increment_seq()
-        message.append_pair(8, self.FIX_VERSION, header=True)
+        message.append_pair(8, self._FIX_VERSION_B, header=True)
         message.append_pair(35, msg_type, header=True)
-        message.append_pair(49, self.SENDERCOMPID, header=True)
-        message.append_pair(56, self.TARGETCOMPID, header=True)
+        message.append_pair(49, self._SENDER_B, header=True)
+        message.append_pair(56, self._TARGET_B, header=True)
         message.append_pair(34, current_seq, header=True)
-        message.append_utc_timestamp(52, precision=0, header=True)
-        message.append_utc_timestamp(60, precision=0)
+        timestamp = self.utc_timestamp()
+        message.append_pair(52, timestamp, header=True)
+        message.append_pair(60, timestamp)
+        return current_seq
         
-        # Store message for potential resend
+    def store_sent(self, seq, msg_type, encoded_msg):
+        """Keep the encoded bytes of application messages for potential resend"""
         if msg_type not in ['0', '1', '2', '4', '5']:
-            self.sent_messages[current_seq] = message
+            self.sent_messages[seq] = encoded_msg
             
     def send_raw_fix(self, raw_fix):
         try:
@@ -181,13 +322,13 @@ class FixClient:
                 for tag in ["8", "35", "49", "56", "34", "52", "60"]:
                     fix_message.remove(tag)
                     
-                self.construct_message(msg_type, fix_message)
-                encoded_msg = fix_message.encode()
-                self.sock.sendall(encoded_msg)
+                with self._send_lock:
+                    seq = self.construct_message(msg_type, fix_message)
+                    encoded_msg = fix_message.encode()
+                    self._send(encoded_msg)
+                    self.store_sent(seq, msg_type, encoded_msg)
                 
-                # Log the formatted outgoing message
-                formatted_msg = self.format_outgoing_message(fix_message)
-                self.log_message(f"Sent Raw FIX: {formatted_msg}")
+                self.log_outgoing("Raw FIX", encoded_msg, fix_message)
             else:
                 self.log_message("Error: No message type (35) found in raw FIX")
         except Exception as e:
@@ -207,148 +348,180 @@ class FixClient:
                     fix_message.append_pair(tag, value)
                     
             if msg_type:
-                self.construct_message(msg_type, fix_message)
-                
-                # Fix BodyLength calculation issue
-                temp_encoded = fix_message.encode()
-                
-                # Recalculate correct BodyLength
-                checksum_pos = temp_encoded.find(b'\x0110=')
-                body_start_pos = temp_encoded.find(b'\x01', temp_encoded.find(b'9=')) + 1
-                actual_body_length = checksum_pos - body_start_pos
-                
-                # Rebuild message with correct BodyLength
-                fix_message.remove(9)  # Remove incorrect BodyLength
-                fix_message.append_pair(9, str(actual_body_length), header=True)  # Add correct one
+                # simplefix computes BodyLength and CheckSum itself and ignores any
+                # user-supplied 9/10 pairs, so a single encode is enough
+                with self._send_lock:
+                    seq = self.construct_message(msg_type, fix_message)
+                    encoded_msg = fix_message.encode()
+                    self._send(encoded_msg)
+                    self.store_sent(seq, msg_type, encoded_msg)
                 
-                encoded_msg = fix_message.encode()
-                self.sock.sendall(encoded_msg)
+                self.log_outgoing(self.get_message_type_description(msg_type), encoded_msg, fix_message)
                 
-                # Log the actual sent message with checksum
-                self.log_message(f"Raw sent bytes: {encoded_msg}")
+                # Byte-level BodyLength/CheckSum diagnostics only when debugging
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    # Log the actual sent message with checksum
+                    self.log_message(f"Raw sent bytes: {encoded_msg}")
                 
-                # Log the formatted outgoing message
-                formatted_msg = self.format_outgoing_message(fix_message)
-                msg_type_desc = self.get_message_type_description(msg_type)
-                self.log_message(f"Sent {msg_type_desc}: {formatted_msg}")
-                
-                # Debug: Check BodyLength calculation
-                if b'\x019=' in encoded_msg:
-                    body_start = encoded_msg.find(b'\x019=') + 1
-                    body_len_end = encoded_msg.find(b'\x01', body_start)
-                    body_len_field = encoded_msg[body_start:body_len_end]
-                    self.log_message(f"BodyLength field: {body_len_field.decode()}")
+                    # Debug: Check BodyLength calculation
+                    if b'\x019=' in encoded_msg:
+                        body_start = encoded_msg.find(b'\x019=') + 1
+                        body_len_end = encoded_msg.find(b'\x01', body_start)
+                        body_len_field = encoded_msg[body_start:body_len_end]
+                        self.log_message(f"BodyLength field: {body_len_field.decode()}")
                     
-                    # Calculate actual body length
-                    checksum_start = encoded_msg.find(b'\x0110=')
-                    if checksum_start > 0:
-                        actual_body = encoded_msg[body_len_end+1:checksum_start]
-                        actual_length = len(actual_body)
-                        self.log_message(f"Actual body length: {actual_length}")
+                        # Calculate actual body length
+                        checksum_start = encoded_msg.find(b'\x0110=')
+                        if checksum_start > 0:
+                            # Body runs up to and including the SOH before 10=
+                            actual_body = encoded_msg[body_len_end+1:checksum_start+1]
+                            actual_length = len(actual_body)
+                            self.log_message(f"Actual body length: {actual_length}")
                         
-                        declared_length = int(body_len_field.decode().split('=')[1])
-                        if declared_length != actual_length:
-                            self.log_message(f"ERROR: BodyLength mismatch! Declared={declared_length}, Actual={actual_length}")
+                            declared_length = int(body_len_field.decode().split('=')[1])
+                            if declared_length != actual_length:
+                                self.log_message(f"ERROR: BodyLength mismatch! Declared={declared_length}, Actual={actual_length}")
                 
-                # Also log if checksum was added
-                if b'\x0110=' in encoded_msg:
-                    checksum_pos = encoded_msg.find(b'\x0110=')
-                    checksum_part = encoded_msg[checksum_pos:checksum_pos+7]
-                    self.log_message(f"Checksum added: {checksum_part}")
-                else:
-                    self.log_message("WARNING: No checksum found in encoded message")
+                    # Also log if checksum was added
+                    if b'\x0110=' in encoded_msg:
+                        checksum_pos = encoded_msg.find(b'\x0110=')
+                        checksum_part = encoded_msg[checksum_pos:checksum_pos+7]
+                        self.log_message(f"Checksum added: {checksum_part}")
+                    else:
+                        self.log_message("WARNING: No checksum found in encoded message")
             else:
                 self.log_message("Error: No message type (35) found")
         except Exception as e:
             self.log_message(f"Error sending custom message: {e}")
             
-    def send_orders_from_file(self, filename='fix_orders.txt'):
+    def send_orders_from_file(self, filename='fix_orders.txt', rate_per_sec=None):
+        """Send orders from file, optionally paced to rate_per_sec orders per second
+
+        Unpaced sends are coalesced into ORDER_BATCH_BYTES writes. Queued bodies are
+        numbered only when their batch is written, so no other message can take a later
+        sequence number and reach the wire ahead of them.
+        """
+        batch = []
+        batch_labels = []
         try:
-            with open(filename, 'r') as f:
+            with open(filename, 'rb') as f:
                 lines = f.readlines()
                 
-            header = lines[0].strip().split('|')
+            # Parse the header once; rows are joined straight into FIX body bytes
+            tags = lines[0].strip().split(b'|')
+            security_idx = tags.index(b'48') if b'48' in tags else None
             self.log_message(f"Processing {len(lines) - 1} orders from {filename}")
             
+            # Persist once at the end of the burst rather than on a timer
+            self._defer_flush = True
+            next_send = time.monotonic()
+            batch_bytes = 0
             for i, line in enumerate(lines[1:], 1):
-                if not line.strip():
+                line = line.strip()
+                if not line:
                     continue
                     
-                values = line.strip().split('|')
-                fix_message = simplefix.FixMessage()
+                values = line.split(b'|')
+                clord_id = self.generate_clordid()
                 
-                # Add standard order fields
-                fix_message.append_pair(35, "D")
-                fix_message.append_pair(11, self.generate_clordid())
-                fix_message.append_pair(21, "1")
+                # Standard order fields, then file data mapped to FIX tags
+                body = b"11=%s\x0121=1\x01" % clord_id.encode()
+                body += b"".join(tag + b"=" + value + b"\x01" for tag, value in zip(tags, values) if value)
+                # SecurityID (48) doubles as Symbol (55)
+                if security_idx is not None and security_idx < len(values) and values[security_idx]:
+                    body += b"55=" + values[security_idx] + b"\x01"
+                body += b"60=%s\x01" % self.utc_timestamp()
                 
-                # Map file data to FIX tags
-                for tag, value in zip(header, values):
-                    if value:
-                        if tag == '48':
-                            fix_message.append_pair(48, value)
-                            fix_message.append_pair(55, value)
-                        else:
-                            fix_message.append_pair(tag, value)
-                            
-                self.construct_message("D", fix_message)
-                encoded_msg = fix_message.encode()
-                self.sock.sendall(encoded_msg)
+                if rate_per_sec:
+                    with self._send_lock:
+                        encoded_msg = self.encode_order(body)
+                        self._send(encoded_msg)
+                else:
+                    batch.append(body)
+                    batch_bytes += len(body)
+                
+                # Log the formatted outgoing message (deferred until the batch is on the wire)
+                label = f"NewOrderSingle #{i} (ClOrdID={clord_id})"
+                if rate_per_sec:
+                    self.log_outgoing(label, encoded_msg)
+                else:
+                    batch_labels.append(label)
+                    if batch_bytes >= self.ORDER_BATCH_BYTES:
+                        self._flush_order_batch(batch, batch_labels)
+                        batch_bytes = 0
                 
-                # Log the formatted outgoing message
-                formatted_msg = self.format_outgoing_message(fix_message)
-                clord_id = fix_message.get(11).decode() if fix_message.get(11) else 'Unknown'
-                self.log_message(f"Sent NewOrderSingle #{i} (ClOrdID={clord_id}): {formatted_msg}")
-                time.sleep(0.1)
+                # Pace against a monotonic deadline so the average rate holds without a per-order sleep floor
+                if rate_per_sec:
+                    next_send += 1.0 / rate_per_sec
+                    slack = next_send - time.monotonic()
+                    if slack > 0:
+                        time.sleep(slack)
                 
+            self._flush_order_batch(batch, batch_labels)
             self.log_message(f"Completed sending {len(lines) - 1} orders")
         except Exception as e:
             self.log_message(f"Error processing orders file: {e}")
+        finally:
+            try:
+                # Orders queued before an error still go out, as they would have when paced
+                self._flush_order_batch(batch, batch_labels)
+            except Exception as e:
+                self.log_message(f"Error flushing queued orders: {e}")
+            self._defer_flush = False
+            self.flush_session_state()
             
+    def encode_order(self, body):
+        """Number and encode a NewOrderSingle body via the header template, keeping it for resend"""
+        seq = self.increment_seq()
+        encoded_msg = self.encode_session_message(b"D", seq, body)
+        self.sent_messages[seq] = encoded_msg
+        return encoded_msg
+        
+    def _flush_order_batch(self, batch, batch_labels):
+        """Number and write queued order bodies in a single sendall, then log them outside the send lock"""
+        if not batch:
+            return
+        try:
+            with self._send_lock:
+                encoded = [self.encode_order(body) for body in batch]
+                self._send(b"".join(encoded))
+            for label, encoded_msg in zip(batch_labels, encoded):
+                self.log_outgoing(label, encoded_msg)
+        finally:
+            batch.clear()
+            batch_labels.clear()
+        
     def generate_clordid(self):
         self.order_counter += 1
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"{timestamp}{self.order_counter:04d}"
+        # Reformat the local-time prefix only when the second rolls over
+        now = int(time.time())
+        if now != self._clordid_sec:
+            self._clordid_sec = now
+            self._clordid_prefix = time.strftime("%Y%m%d%H%M%S", time.localtime(now))
+        return f"{self._clordid_prefix}{self.order_counter:04d}"
         
     def send_sequence_reset(self, new_seq):
         try:
-            reset_msg = simplefix.FixMessage()
-            reset_msg.append_pair(8, self.FIX_VERSION)
-            reset_msg.append_pair(35, "4")
-            reset_msg.append_pair(49, self.SENDERCOMPID)
-            reset_msg.append_pair(56, self.TARGETCOMPID)
-            reset_msg.append_pair(34, self.increment_seq())
-            reset_msg.append_utc_timestamp(52, precision=0)
-            reset_msg.append_pair(123, "N")
-            reset_msg.append_pair(36, str(new_seq))
-            encoded_msg = reset_msg.encode()
-            self.sock.sendall(encoded_msg)
-            self.seq = new_seq - 1
-            self.save_session_state()
+            body = f"123=N\x0136={new_seq}\x01".encode()
+            with self._send_lock:
+                encoded_msg = self.encode_session_message(b"4", self.increment_seq(), body)
+                self._send(encoded_msg)
+                self.seq = new_seq - 1
+            self._dirty_seq = True
+            self.flush_session_state()
             
-            # Log the formatted outgoing message
-            formatted_msg = self.format_outgoing_message(reset_msg)
-            self.log_message(f"Sent SequenceReset: {formatted_msg}")
+            self.log_outgoing("SequenceReset", encoded_msg)
         except Exception as e:
             self.log_message(f"Error sending sequence reset: {e}")
             
     def send_resend_request(self, begin_seq, end_seq):
         try:
-            resend_msg = simplefix.FixMessage()
-            resend_msg.append_pair(8, self.FIX_VERSION)
-            resend_msg.append_pair(35, "2")
-            resend_msg.append_pair(49, self.SENDERCOMPID)
-            resend_msg.append_pair(56, self.TARGETCOMPID)
-            resend_msg.append_pair(34, self.increment_seq())
-            resend_msg.append_utc_timestamp(52, precision=0)
-            resend_msg.append_pair(7, str(begin_seq))
-            resend_msg.append_pair(16, str(end_seq))
-            encoded_msg = resend_msg.encode()
-            self.sock.sendall(encoded_msg)
+            body = f"7={begin_seq}\x0116={end_seq}\x01".encode()
+            with self._send_lock:
+                encoded_msg = self.encode_session_message(b"2", self.increment_seq(), body)
+                self._send(encoded_msg)
             
-            # Log the formatted outgoing message
-            formatted_msg = self.format_outgoing_message(resend_msg)
-            self.log_message(f"Sent ResendRequest: {formatted_msg}")
+            self.log_outgoing("ResendRequest", encoded_msg)
         except Exception as e:
             self.log_message(f"Error sending resend request: {e}")
             
@@ -356,16 +529,25 @@ class FixClient:
         parser = simplefix.FixParser()
         parser.set_allow_empty_values(True)
         
+        # Reusable receive buffer - one large read per syscall, no per-read allocation
+        self._rxbuf = bytearray(self.RECV_BUFFER_SIZE)
+        self._rxview = memoryview(self._rxbuf)
+        
         while self.running:
             try:
-                response = self.sock.recv(4096)
-                if not response:
-                    self.log_message("Socket disconnected - exiting program")
-                    import sys
-                    sys.exit(1)
+                # Wait for data with a timeout so disconnect() is noticed within a second
+                readable, _, errored = select.select([self.sock], [], [self.sock], 1.0)
+                if not (readable or errored):
+                    continue
                     
-                response = response.replace(b'|', b'\x01')
-                parser.append_buffer(response.decode())
+                n = self.sock.recv_into(self._rxview)
+                if not n:
+                    self.log_message("Socket disconnected - stopping receiver")
+                    self.running = False
+                    break
+                    
+                # FIX is ASCII - translate pipe delimiters in one C-level pass, no str round-trip
+                parser.append_buffer(self._rxview[:n].tobytes().translate(_PIPE_TO_SOH))
                 
                 # Process ALL messages in buffer immediately
                 while True:
@@ -373,18 +555,20 @@ class FixClient:
                     if not message:
                         break
                         
-                    msg_type = message.get(35)
+                    fields = _to_dict(message)
+                    msg_type = fields.get(35)
                     if not msg_type:
                         continue
                     
                     # Handle sequence numbers (skip heartbeats)
                     if msg_type != b'0':
-                        msg_seq = int(message.get(34).decode()) if message.get(34) else 0
-                        poss_dup_flag = message.get(43) == b'Y'
+                        msg_seq = int(fields[34]) if fields.get(34) else 0
+                        poss_dup_flag = fields.get(43) == b'Y'
                         
                         if msg_type == b'2':  # ResendRequest - update inseq to tag34 value
                             self.expected_seq = msg_seq + 1
-                            self.save_session_state()
+                            self._dirty_seq = True
+                            self.flush_session_state()
                         elif not poss_dup_flag:  # Normal message - update sequence
                             self.expected_seq = msg_seq + 1
                         # Messages with 43=Y are ignored for sequence update
@@ -396,11 +580,11 @@ class FixClient:
                     elif msg_type == b'2':  # Resend Request
                         formatted_msg = self.format_fix_message(message)
                         self.log_message(f"Received ResendRequest: {formatted_msg}")
-                        self.handle_resend_request(message)
+                        self.handle_resend_request(fields)
                     elif msg_type == b'4':  # Sequence Reset
                         formatted_msg = self.format_fix_message(message)
                         self.log_message(f"Received SequenceReset: {formatted_msg}")
-                        self.handle_sequence_reset(message)
+                        self.handle_sequence_reset(fields)
                     elif msg_type == b'5':  # Logout
                         formatted_msg = self.format_fix_message(message)
                         self.log_message(f"Received Logout: {formatted_msg}")
@@ -418,36 +602,25 @@ class FixClient:
                             self.gui_callback(exec_msg)
                     else:  # Other msg:
                         other_msg = self.format_fix_message(message)
-                        msg_type_str = msg_type.decode() if isinstance(msg_type, bytes) else str(msg_type)
-                        msg_desc = self.get_message_type_description(msg_type_str)
+                        msg_desc = self.get_message_type_description(msg_type)
                         self.log_message(f"Received {msg_desc}: {other_msg}")
 
             except Exception as e:
                 if self.running:
-                    self.log_message(f"Socket error: {e} - exiting program")
-                    import sys
-                    sys.exit(1)
+                    self.log_message(f"Socket error: {e} - stopping receiver")
+                    self.running = False
                 break
                 
     def send_heartbeat(self):
-        heartbeat_message = simplefix.FixMessage()
-        heartbeat_message.append_pair(8, self.FIX_VERSION)
-        heartbeat_message.append_pair(35, "0")
-        heartbeat_message.append_pair(49, self.SENDERCOMPID)
-        heartbeat_message.append_pair(56, self.TARGETCOMPID)
-        heartbeat_message.append_pair(34, self.increment_seq())
-        heartbeat_message.append_utc_timestamp(52, precision=0)
-        
-        encoded_msg = heartbeat_message.encode()
-        self.sock.sendall(encoded_msg)
+        with self._send_lock:
+            encoded_msg = self.encode_session_message(b"0", self.increment_seq())
+            self._send(encoded_msg)
         
-        # Log the formatted outgoing message
-        formatted_msg = self.format_outgoing_message(heartbeat_message)
-        self.log_message(f"Sent Heartbeat: {formatted_msg}")
+        self.log_outgoing("Heartbeat", encoded_msg)
         
-    def handle_resend_request(self, message):
-        begin_seq = int(message.get(7).decode())
-        end_seq_raw = message.get(16).decode()
+    def handle_resend_request(self, fields):
+        begin_seq = int(fields[7])
+        end_seq_raw = fields[16].decode()
         end_seq = 999999 if end_seq_raw == '0' else int(end_seq_raw)
         
         self.log_message(f"Received resend request for seq {begin_seq} to {end_seq}")
@@ -457,26 +630,15 @@ class FixClient:
         self.send_gap_fill(begin_seq, actual_end_seq + 1)
         
     def send_gap_fill(self, begin_seq, new_seq):
-        gap_fill_msg = simplefix.FixMessage()
-        gap_fill_msg.append_pair(8, self.FIX_VERSION)
-        gap_fill_msg.append_pair(35, "4")
-        gap_fill_msg.append_pair(49, self.SENDERCOMPID)
-        gap_fill_msg.append_pair(56, self.TARGETCOMPID)
-        gap_fill_msg.append_pair(34, begin_seq)
-        gap_fill_msg.append_utc_timestamp(52, precision=0)
-        gap_fill_msg.append_pair(123, "Y")
-        gap_fill_msg.append_pair(36, str(new_seq))
-        gap_fill_msg.append_pair(43, "Y")
-        encoded_msg = gap_fill_msg.encode()
-        self.sock.sendall(encoded_msg)
+        body = f"123=Y\x0136={new_seq}\x0143=Y\x01".encode()
+        encoded_msg = self.encode_session_message(b"4", begin_seq, body)
+        self._send(encoded_msg)
         
-        # Log the formatted outgoing message
-        formatted_msg = self.format_outgoing_message(gap_fill_msg)
-        self.log_message(f"Sent GapFill: {formatted_msg}")
+        self.log_outgoing("GapFill", encoded_msg)
         
-    def handle_sequence_reset(self, message):
-        new_seq = int(message.get(36).decode())
-        gap_fill = message.get(123) == b'Y'
+    def handle_sequence_reset(self, fields):
+        new_seq = int(fields[36])
+        gap_fill = fields.get(123) == b'Y'
         
         if gap_fill:
             self.log_message(f"Received gap fill reset to seq {new_seq}")
@@ -484,48 +646,32 @@ class FixClient:
             self.log_message(f"Received sequence reset to seq {new_seq}")
             
         self.expected_seq = new_seq
-        self.save_session_state()
+        self._dirty_seq = True
+        self.flush_session_state()
         
     def format_fix_message(self, message):
         """Format FIX message for parsing by GUI"""
         try:
-            formatted_pairs = []
-            # Get ALL tags from the message, not just a subset
-            for tag_num in range(1, 10000):  # Check all possible tags
-                value = message.get(tag_num)
-                if value:
-                    formatted_pairs.append(f"{tag_num}={value.decode() if isinstance(value, bytes) else value}")
-            return "|".join(formatted_pairs)
+            return _format_pairs(message.pairs)
         except Exception as e:
             return str(message)
     
-    def format_outgoing_message(self, message):
+    def log_outgoing(self, label, encoded_msg, message=None):
+        """Log a sent message, formatting it only when the log or GUI will see the text"""
+        # With no GUI attached, SENDFIX_LOG_LEVEL=WARNING (see setup_logging) skips the formatting
+        if self.message_callback or self.logger.isEnabledFor(logging.INFO):
+            self.log_message(f"Sent {label}: {self.format_outgoing_message(message, encoded_msg)}")
+            
+    def format_outgoing_message(self, message, encoded_msg=None):
         """Format outgoing FIX message for logging"""
         try:
-            formatted_pairs = []
-            # Get ALL tags from the message
-            for tag_num in range(1, 10000):
-                value = message.get(tag_num)
-                if value:
-                    formatted_pairs.append(f"{tag_num}={value.decode() if isinstance(value, bytes) else value}")
-            return "|".join(formatted_pairs)
+            if encoded_msg is not None:
+                # Already on the wire format - just swap delimiters
+                return encoded_msg.rstrip(b'\x01').replace(b'\x01', b'|').decode()
+            return _format_pairs(message.pairs)
         except Exception as e:
             return str(message)
     
     def get_message_type_description(self, msg_type):
         """Get human-readable description for message type"""
-        msg_types = {
-            '0': 'Heartbeat',
-            '1': 'TestRequest', 
-            '2': 'ResendRequest',
-            '3': 'Reject',
-            '4': 'SequenceReset',
-            '5': 'Logout',
-            'A': 'Logon',
-            'D': 'NewOrderSingle',
-            'F': 'OrderCancelRequest',
-            'G': 'OrderCancelReplaceRequest',
-            '8': 'ExecutionReport',
-            '9': 'OrderCancelReject'
-        }
-        return msg_types.get(msg_type, f'MsgType({msg_type})')
\ No newline at end of file
+        return _MSG_TYPES.get(msg_type) or f'MsgType({_decode(msg_type) if isinstance(msg_type, bytes) else msg_type})'
\ No newline at end of file
@@ -2,16 +2,21 @@
 
 # Gunicorn configuration for SendFix Web Application
 
+import os
+
 # Server socket
 bind = "127.0.0.1:5001"
 backlog = 2048
 
 # Worker processes - Use 1 worker for Flask-SocketIO
-workers = 1
+# FIX sessions (multi_client) live in process memory, so extra workers would each
+# hold their own sessions. Only raise SENDFIX_WORKERS once session state and
+# Socket.IO events are shared (e.g. a Redis message_queue plus sticky sessions).
+workers = int(os.environ.get("SENDFIX_WORKERS", "1"))
 worker_class = "gevent"
-worker_connections = 1000
+worker_connections = 4000
 timeout = 30
-keepalive = 2
+keepalive = 30  # Long-lived WebSocket / polling connections
 
 # Restart workers after this many requests, to help prevent memory leaks
 max_requests = 1000
@@ -1,146 +1,291 @@
 import quickfix as fix
 import json
 import os
+import sys
+import threading
+import time
+import weakref
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
 from quickfix_client import QuickFixClient
+try:
+    import orjson as _json  # Optional; noticeably faster on large session configs
+except ImportError:
+    _json = json
+
+# How long a client.is_connected() answer is reused within a GUI refresh burst
+CONNECTED_CACHE_TTL = 0.05
+
+SESSION_CONFIG_FILE = 'multi_session_config.json'
+
+SessionInfo = namedtuple('SessionInfo', 'name host port sender target connected')
+
+# Used when SESSION_CONFIG_FILE is missing or unreadable; read-only so it can be shared
+DEFAULT_CONFIGS = (
+    MappingProxyType({
+        "name": sys.intern("LQNT UAT"),
+        "server_ip": "hk1qvphxcrt01",
+        "port": 5731,
+        "fix_version": "FIX.4.2",
+        "sender_comp_id": "JCHUNG",
+        "target_comp_id": "LQNTHKUAT",
+        "heartbeat_interval": 30
+    }),
+)
+
+# Parsed session lists keyed by (path, mtime_ns), shared by every MultiFixClient in the process
+_CONFIG_CACHE = {}
 
 class MultiFixClient:
-    def __init__(self, message_callback=None, session_callback=None):
+    def __init__(self, message_callback=None, session_callback=None, watch_config=False):
         self.message_callback = message_callback
         self.session_callback = session_callback
         self.sessions = {}
         self.active_session = None
         self.session_states = {}  # Track session states
+        self._sid_to_name = {}  # str(SessionID) -> config name
+        # id(SessionID) -> (SessionID, str, config name); holding the object pins its id
+        self._sid_str_cache = {}
+        self._connected_cache = weakref.WeakKeyDictionary()  # client -> (monotonic ts, bool)
+        self._connected = set()  # Config names currently logged on (or listening, for acceptors)
+        self._config_mtime = None
+        self._current_info = None  # (client, SessionInfo) for the active session
+        # Serialises connect_session so concurrent callers (e.g. scheduler jobs) don't race on sessions
+        self._connect_lock = threading.Lock()
         self.load_session_configs()
+        if watch_config:
+            self.start_config_watcher()
         
     def session_state_callback(self, state, session_id):
         """Handle session state changes"""
-        session_str = str(session_id)
+        cached = self._sid_str_cache.get(id(session_id))
+        if cached is not None and cached[0] is session_id:
+            # Same SessionID object the client stored on logon; skip re-formatting it
+            session_str, name = cached[1], cached[2]
+        else:
+            session_str = str(session_id)
+            name = self._sid_to_name.get(session_str)
+            if name is None:
+                # SessionID is only assigned on logon, so index it the first time it is seen
+                for candidate, client in self.sessions.items():
+                    if client.session_id and str(client.session_id) == session_str:
+                        name = self._sid_to_name[sys.intern(session_str)] = candidate
+                        break
+            if name is not None and getattr(self.sessions.get(name), 'session_id', None) is session_id:
+                self._sid_str_cache[id(session_id)] = (session_id, session_str, name)
         self.session_states[session_str] = state
         # Also store by config name for lookup
-        for name, client in self.sessions.items():
-            if client.session_id and str(client.session_id) == session_str:
-                self.session_states[name] = state
-                break
+        if name is not None:
+            self.session_states[name] = state
+            client = self.sessions.get(name)
+            if client is not None:
+                self._connected_cache.pop(client, None)
+            self._current_info = None
+            if state == 'connected':
+                self._connected.add(name)
+            elif state == 'disconnected' and not (client is not None and client.is_connected()):
+                # A listening acceptor stays connected when its counterparty logs out
+                self._connected.discard(name)
         if self.session_callback:
             self.session_callback(state, session_str)
         
     def load_session_configs(self):
         """Load session configurations from JSON file"""
-        try:
-            with open('multi_session_config.json', 'r') as f:
-                config = json.load(f)
-                self.session_configs = config['sessions']
-        except Exception as e:
-            # Fallback to default sessions
-            self.session_configs = [
-                {
-                    "name": "LQNT UAT",
-                    "server_ip": "hk1qvphxcrt01",
-                    "port": 5731,
-                    "fix_version": "FIX.4.2",
-                    "sender_comp_id": "JCHUNG",
-                    "target_comp_id": "LQNTHKUAT",
-                    "heartbeat_interval": 30
-                }
-            ]
+        path = SESSION_CONFIG_FILE
+        self.config_error = None
+        if not os.path.exists(path):
+            mtime = None
+            sessions = DEFAULT_CONFIGS
+        else:
+            mtime = os.stat(path).st_mtime_ns
+            key = (path, mtime)
+            sessions = _CONFIG_CACHE.get(key)
+            if sessions is None:
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                    sessions = _json.loads(data)['sessions']
+                    # Interned names let session dict lookups hit the identity fast path
+                    for config in sessions:
+                        config['name'] = sys.intern(config['name'])
+                    _CONFIG_CACHE.clear()  # Drop entries for older mtimes
+                    _CONFIG_CACHE[key] = sessions
+                except (OSError, ValueError, TypeError, KeyError) as e:
+                    # Unreadable or corrupt file: keep running on the defaults but make the cause visible
+                    self.config_error = e
+                    sessions = DEFAULT_CONFIGS
+                    if self.message_callback:
+                        self.message_callback(f"*** Invalid {path}, using default sessions: {e} ***")
+        config_by_name = {}
+        for config in sessions:
+            config_by_name.setdefault(config['name'], config)  # First entry wins, as the old scan did
+        # Build everything first so a reload swaps in a complete snapshot
+        self.session_configs = sessions
+        self._config_by_name = config_by_name
+        self._session_names = tuple(config_by_name)
+        self._config_mtime = mtime
+        
+    def start_config_watcher(self, interval=1.0):
+        """Poll the session config mtime in a daemon thread and reload only when it changes"""
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    mtime = os.stat(SESSION_CONFIG_FILE).st_mtime_ns
+                except OSError:
+                    mtime = None
+                if mtime != self._config_mtime:
+                    self.load_session_configs()
+                    if self.message_callback:
+                        self.message_callback(f"*** SESSION CONFIG RELOADED: {len(self.session_configs)} sessions ***")
+        threading.Thread(target=watch, name='session-config-watcher', daemon=True).start()
             
     def get_session_names(self):
         """Get list of available session names"""
-        return [session['name'] for session in self.session_configs]
+        return self._session_names
         
-    def connect_session(self, session_name):
-        """Connect to a specific session - always create completely fresh client"""
-        try:
-            # ALWAYS create fresh client - disconnect and remove old one if exists
-            if session_name in self.sessions:
-                old_client = self.sessions[session_name]
-                old_client.disconnect()
-                # Wait for clean disconnect
-                import time
-                time.sleep(0.5)
-                del self.sessions[session_name]
-                if self.message_callback:
-                    self.message_callback(f"*** FRESH CLIENT: Removed old client for {session_name} ***")
-            
-            # Clear any stale QuickFIX sessions
-            import os
-            import glob
-            session_files = glob.glob(f"store/*{session_name}*")
-            for f in session_files:
-                try:
-                    os.remove(f)
+    def connect_session(self, session_name, force=False):
+        """Connect to a specific session - create a completely fresh client unless it is already logged on"""
+        if isinstance(session_name, str):
+            session_name = sys.intern(session_name)
+        with self._connect_lock:
+            try:
+                # Repeat clicks on a live session just select it; force=True still rebuilds it
+                if not force and session_name in self.sessions:
+                    if session_name in self._connected or self._is_connected_cached(self.sessions[session_name]):
+                        self._connected.add(session_name)
+                        self.active_session = session_name
+                        return True, f"Already connected to {session_name}"
+                
+                # Otherwise ALWAYS create fresh client - disconnect and remove old one if exists
+                if session_name in self.sessions:
+                    old_client = self.sessions[session_name]
+                    old_client.disconnect()
+                    # Wait for clean disconnect
+                    import time
+                    time.sleep(0.5)
+                    del self.sessions[session_name]
+                    self._forget_session_ids(session_name)
+                    self._connected.discard(session_name)
                     if self.message_callback:
-                        self.message_callback(f"*** CLEANED: Removed {f} ***")
-                except:
-                    pass
-            
-            # Find session config
-            session_config = None
-            for config in self.session_configs:
-                if config['name'] == session_name:
-                    session_config = config
-                    break
+                        self.message_callback(f"*** FRESH CLIENT: Removed old client for {session_name} ***")
+                
+                # Clear any stale QuickFIX sessions
+                import os
+                import glob
+                session_files = glob.glob(f"store/*{session_name}*")
+                for f in session_files:
+                    try:
+                        os.remove(f)
+                        if self.message_callback:
+                            self.message_callback(f"*** CLEANED: Removed {f} ***")
+                    except:
+                        pass
+                
+                # Find session config
+                session_config = self._config_by_name.get(session_name)
+                        
+                if not session_config:
+                    return False, f"Session {session_name} not found"
                     
-            if not session_config:
-                return False, f"Session {session_name} not found"
+                # Determine connection type
+                connection_type = session_config.get('connection_type', 'initiator')
                 
-            # Determine connection type
-            connection_type = session_config.get('connection_type', 'initiator')
-            
-            # Create new client with session config (don't disconnect others)
-            client = QuickFixClient(self.message_callback, self.session_state_callback, connection_type)
-            client.gui_callback = self.message_callback  # Set GUI callback for execution reports
-            
-            if self.message_callback:
-                self.message_callback(f"*** NEW CLIENT CREATED: {session_name} -> Object ID: {id(client)} ***")
-            
-            # Override config with session-specific values
-            client.HOST = session_config.get('server_ip', 'localhost')  # Acceptors don't need server_ip
-            client.PORT = session_config['port']
-            client.FIX_VERSION = session_config['fix_version']
-            client.SENDERCOMPID = session_config['sender_comp_id']
-            client.TARGETCOMPID = session_config['target_comp_id']
-            client.HEARTBEAT = session_config['heartbeat_interval']
-            
-            # Apply session-specific QuickFIX overrides if present
-            if 'quickfix_overrides' in session_config:
-                client.quickfix_overrides = session_config['quickfix_overrides']
-            
-            # Connect without timeout checks
-            client.connect()
-            self.sessions[session_name] = client
-            self.active_session = session_name
-            
-            if self.message_callback:
-                self.message_callback(f"*** CLIENT STORED: {session_name} -> sessions[{session_name}] = {id(client)} ***")
-                self.message_callback(f"*** CLIENT SESSION_ID AT STORAGE: {id(client.session_id) if client.session_id else 'None'} ***")
-            return True, f"Connecting to {session_name}..."
+                # Create new client with session config (don't disconnect others)
+                # Session-specific values (and any quickfix_overrides) are applied by the constructor
+                client = QuickFixClient(self.message_callback, self.session_state_callback, connection_type,
+                                        config={**session_config})
+                client.gui_callback = self.message_callback  # Set GUI callback for execution reports
+                
+                if self.message_callback:
+                    self.message_callback(f"*** NEW CLIENT CREATED: {session_name} -> Object ID: {id(client)} ***")
+                
+                # Connect without timeout checks
+                client.connect()
+                self.sessions[session_name] = client
+                if client.session_id:
+                    session_str = sys.intern(str(client.session_id))
+                    self._sid_to_name[session_str] = session_name
+                    self._sid_str_cache[id(client.session_id)] = (client.session_id, session_str, session_name)
+                # Acceptors count as connected while listening and get no logon callback for that;
+                # an initiator may also have logged on before it was stored above
+                if client.is_connected():
+                    self._connected.add(session_name)
+                self.active_session = session_name
                 
-        except Exception as e:
-            return False, f"Error connecting to {session_name}: {e}"
+                if self.message_callback:
+                    self.message_callback(f"*** CLIENT STORED: {session_name} -> sessions[{session_name}] = {id(client)} ***")
+                    self.message_callback(f"*** CLIENT SESSION_ID AT STORAGE: {id(client.session_id) if client.session_id else 'None'} ***")
+                return True, f"Connecting to {session_name}..."
+                    
+            except Exception as e:
+                return False, f"Error connecting to {session_name}: {e}"
+            
+    def _is_connected_cached(self, client):
+        """client.is_connected() reused for CONNECTED_CACHE_TTL; logon/logout events invalidate it"""
+        now = time.monotonic()
+        cached = self._connected_cache.get(client)
+        if cached is not None and now - cached[0] < CONNECTED_CACHE_TTL:
+            return cached[1]
+        connected = client.is_connected()
+        self._connected_cache[client] = (now, connected)
+        return connected
+        
+    def _forget_session_ids(self, session_name):
+        """Drop reverse-index entries that map to a session being torn down"""
+        for sid in [sid for sid, name in self._sid_to_name.items() if name == session_name]:
+            del self._sid_to_name[sid]
+        for key in [key for key, entry in self._sid_str_cache.items() if entry[2] == session_name]:
+            del self._sid_str_cache[key]
             
     def disconnect_current(self):
         """Disconnect current active session"""
         if self.active_session and self.active_session in self.sessions:
-            self.sessions[self.active_session].disconnect()
+            client = self.sessions[self.active_session]
+            client.disconnect()
             del self.sessions[self.active_session]
+            self._connected_cache.pop(client, None)
+            self._forget_session_ids(self.active_session)
+            self._connected.discard(self.active_session)
             self.active_session = None
             
     def disconnect_session(self, session_name):
         """Disconnect specific session"""
         if session_name in self.sessions:
-            self.sessions[session_name].disconnect()
+            client = self.sessions[session_name]
+            client.disconnect()
             del self.sessions[session_name]
+            self._connected_cache.pop(client, None)
+            self._forget_session_ids(session_name)
+            self._connected.discard(session_name)
             if self.active_session == session_name:
                 self.active_session = None
                 
+    def disconnect_all(self):
+        """Disconnect every session, overlapping their logout handshakes"""
+        if not self.sessions:
+            return
+        sessions = dict(self.sessions)
+        with ThreadPoolExecutor(max_workers=min(32, len(sessions))) as pool:
+            futures = {pool.submit(client.disconnect): name for name, client in sessions.items()}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    if self.message_callback:
+                        self.message_callback(f"Error disconnecting {futures[future]}: {e}")
+        self.sessions.clear()
+        self._sid_to_name.clear()
+        self._sid_str_cache.clear()
+        self._connected_cache.clear()
+        self._connected.clear()
+        self._current_info = None
+        self.active_session = None
+                
     def get_all_sessions(self):
         """Get all connected sessions"""
-        connected_sessions = {}
-        for name, client in self.sessions.items():
-            if client.is_connected():
-                connected_sessions[name] = client
-        return connected_sessions
+        return {name: self.sessions[name] for name in self._connected if name in self.sessions}
             
     def get_current_client(self):
         """Get current active client"""
@@ -154,18 +299,18 @@ class MultiFixClient:
         return None
         
     def get_current_session_info(self):
-        """Get current session information"""
+        """Get current session information, rebuilt only when the active client or its state changes"""
         if self.active_session:
-            client = self.get_current_client()
+            client = self.sessions.get(self.active_session)
             if client:
-                return {
-                    'name': self.active_session,
-                    'host': client.HOST,
-                    'port': client.PORT,
-                    'sender': client.SENDERCOMPID,
-                    'target': client.TARGETCOMPID,
-                    'connected': client.is_connected()
-                }
+                cached = self._current_info
+                # active_session is also assigned directly by the web app, so check the key here
+                if cached is not None and cached[0] is client and cached[1].name == self.active_session:
+                    return cached[1]
+                info = SessionInfo(self.active_session, client.HOST, client.PORT, client.SENDERCOMPID,
+                                   client.TARGETCOMPID, self._is_connected_cached(client))
+                self._current_info = (client, info)
+                return info
         return None
         
     def is_connected(self):
@@ -175,10 +320,10 @@ class MultiFixClient:
         client = self.get_current_client()
         if not client:
             return False
-        return client.is_connected()
+        return self._is_connected_cached(client)
         
     def is_session_connected(self, session_name):
         """Check if specific session is connected"""
         if session_name in self.sessions:
-            return self.sessions[session_name].is_connected()
+            return self._is_connected_cached(self.sessions[session_name])
         return False
\ No newline at end of file
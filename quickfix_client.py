@@ -2,60 +2,310 @@ import quickfix as fix
 import threading
 import time
 import logging
+import logging.handlers
+import queue
+import atexit
 import configparser
-from datetime import datetime
 import json
 import os
+from functools import lru_cache
+from itertools import compress, repeat
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that runs strftime for asctime at most once per second"""
+    _cached = (None, None)
+    
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        cached = self._cached
+        if cached[0] != sec:
+            cached = self._cached = (sec, time.strftime(datefmt or self.default_time_format, self.converter(record.created)))
+        return cached[1]
+
+# Background writer for sendfix_quickfix.log; started by the first client that configures logging
+_log_listener = None
+
+# message_callback (GUI/CLI) calls run on one background thread so FIX callback threads never
+# wait on them; a single consumer keeps messages in order
+_callback_queue = queue.SimpleQueue()
+_callback_thread = None
+_callback_lock = threading.Lock()
+
+def _drain_callbacks():
+    while True:
+        item = _callback_queue.get()
+        if item is None:
+            return
+        callback, message = item
+        try:
+            callback(message)
+        except Exception:
+            logging.getLogger(__name__).exception("message_callback failed")
+
+def _stop_callbacks():
+    """Deliver whatever is still queued before the interpreter exits"""
+    _callback_queue.put(None)
+    _callback_thread.join(timeout=2)
+
+def _dispatch_callback(callback, message):
+    global _callback_thread
+    if _callback_thread is None:
+        with _callback_lock:
+            if _callback_thread is None:
+                _callback_thread = threading.Thread(target=_drain_callbacks, name='quickfix-callbacks', daemon=True)
+                _callback_thread.start()
+                atexit.register(_stop_callbacks)
+    _callback_queue.put((callback, message))
+
+def wait_for_callbacks(timeout=2.0):
+    """Block until the message_callback calls queued so far have run; False on timeout"""
+    if _callback_thread is None:
+        return True
+    done = threading.Event()
+    _callback_queue.put((lambda message: done.set(), None))
+    return done.wait(timeout)
+
+# Parsed config files keyed by path -> (mtime_ns, value); re-parsed only when the file changes
+_CONFIG_CACHE = {}
+
+def _load_cached(path, parse):
+    """Return parse(path), reusing the previous result while the file's mtime is unchanged"""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _CONFIG_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    value = parse(path)
+    _CONFIG_CACHE[path] = (mtime, value)
+    return value
+
+def _parse_sendfix_cfg(path):
+    config = configparser.ConfigParser()
+    config.read(path)
+    section = config['DEFAULT']
+    return (section['ServerIP'], int(section['Port']), section['FixVersion'],
+            section['SenderCompId'], section['TargetCompId'], int(section['HeartbeatInterval']))
+
+_MSGTYPE_DESC = {
+    '0': 'Heartbeat',
+    '1': 'TestRequest',
+    '2': 'ResendRequest',
+    '3': 'Reject',
+    '4': 'SequenceReset',
+    '5': 'Logout',
+    'A': 'Logon',
+    'D': 'NewOrderSingle',
+    'F': 'OrderCancelRequest',
+    'G': 'OrderCancelReplaceRequest',
+    '8': 'ExecutionReport',
+    '9': 'OrderCancelReject'
+}
+
+# Prebuilt header fields; setField copies the value, so one instance serves every message
+_MSGTYPE_NOS = fix.MsgType(fix.MsgType_NewOrderSingle)
+_MSGTYPE_NOL = fix.MsgType(fix.MsgType_NewOrderList)
+_MSGTYPE_OCR = fix.MsgType(fix.MsgType_OrderCancelRequest)
+_MSGTYPE_OCRR = fix.MsgType(fix.MsgType_OrderCancelReplaceRequest)
+_MSGTYPE_SEQRESET = fix.MsgType(fix.MsgType_SequenceReset)
+_EXECREPORT_CODE = fix.MsgType_ExecutionReport
+_HANDLINST_AUTO = fix.HandlInst('1')  # Automated execution, no broker intervention
+
+# Field factories for the handful of distinct values these tags take; safe to share
+# because setField copies the value out of the field
+@lru_cache(maxsize=64)
+def _begin_string(value):
+    return fix.BeginString(value)
+
+@lru_cache(maxsize=64)
+def _msg_type(value):
+    return fix.MsgType(value)
+
+@lru_cache(maxsize=8)
+def _gap_fill_flag(value):
+    return fix.GapFillFlag(value)
+
+# send_raw_fix: header tags routed to their typed field, and tags QuickFIX fills in itself
+_RAW_HEADER_FIELDS = {
+    35: _msg_type,
+    49: fix.SenderCompID,       # Optional override
+    56: fix.TargetCompID,       # Optional override
+    50: fix.SenderSubID,        # Routing
+    115: fix.OnBehalfOfCompID,  # Routing
+}
+_RAW_SKIP_TAGS = frozenset({8, 9, 10, 34, 52})
+
+# send_custom_message: same idea, but BeginString may be overridden and CompIDs are not
+_CUSTOM_HEADER_FIELDS = {
+    8: _begin_string,
+    35: _msg_type,
+}
+_CUSTOM_SKIP_TAGS = frozenset({49, 56, 34, 52})
+
+# Custom order tags that belong in the header for routing; everything else goes in the body
+_ORDER_HEADER_FIELDS = {
+    50: fix.SenderSubID,
+    115: fix.OnBehalfOfCompID,
+}
+
+def _order_tag_setter(tag):
+    """Resolve once where a custom order tag goes; returns setter(message, header, value)"""
+    header_field = _ORDER_HEADER_FIELDS.get(tag)
+    if header_field is not None:
+        return lambda message, header, value: header.setField(header_field(value))
+    return lambda message, header, value: message.setField(tag, value)
+
+# Unpaced order sends hand their log lines to log_message in batches of this many
+_SENT_LOG_BATCH = 256
+
+def parse_order_header(header_line):
+    """Parse a '|'-separated order file header into (tags, keep)
+    
+    Empty columns (e.g. from a trailing '|') are dropped: tags holds the int tag of each kept
+    column and keep the per-column selectors to apply to data rows with itertools.compress.
+    """
+    columns = [tag.strip() for tag in header_line.strip().split('|')]
+    return tuple(int(tag) for tag in columns if tag), tuple(bool(tag) for tag in columns)
+
+# Reusable field holders for reading incoming values. toApp runs on the sending thread while
+# fromApp/fromAdmin run on the QuickFIX thread, so each thread gets its own set.
+_field_cache = threading.local()
+
+def _msg_type_of(message):
+    """Read MsgType from the header without constructing a new fix.MsgType per call"""
+    try:
+        field = _field_cache.msg_type
+    except AttributeError:
+        field = _field_cache.msg_type = fix.MsgType()
+    message.getHeader().getField(field)
+    return field.getValue()
+
+def _text_field():
+    try:
+        return _field_cache.text
+    except AttributeError:
+        field = _field_cache.text = fix.Text()
+        return field
+
+# (content, mtime_ns) of the last quickfix_client.cfg this process wrote
+_last_written_cfg = None
+# Every client shares quickfix_client.cfg; held from writing it until SessionSettings has read it
+_cfg_lock = threading.Lock()
+
+def _parse_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
 
 class QuickFixClient(fix.Application):
-    def __init__(self, message_callback=None, session_callback=None, connection_type='initiator'):
+    # Message store used for every session. The Python bindings don't expose MessageStore for
+    # subclassing, so a custom (e.g. mmap-backed) store has to come from C++; sessions that
+    # don't need persisted resends can use fix.MemoryStoreFactory to skip disk I/O entirely.
+    STORE_FACTORY = fix.FileStoreFactory
+    
+    def __init__(self, message_callback=None, session_callback=None, connection_type='initiator', config=None):
         super().__init__()
         self.message_callback = message_callback
         self.session_callback = session_callback
         self.connection_type = connection_type
         self.setup_logging()
-        self.load_config()
+        if config is None:
+            self.load_config()
         self.session_id = None
         self.order_counter = 0
         self.running = False
         self.logged_on = False
+        self._connected = False  # logged_on and running with a live session_id; what is_connected() returns
         self.connection_failed = False
         self.quickfix_overrides = {}
+        self.gui_callback = None
+        self.last_heartbeat_recv_time = None  # time.monotonic() of the last inbound Heartbeat
         self.connection_count = 0
+        self._settings = None
+        self._logout_event = threading.Event()  # Set by onLogout so disconnect() needn't sleep blindly
+        self._settings_key = None
+        self._transact_time = (None, None)  # (epoch second, fix.TransactTime)
+        self._clordid_prefix = (None, '')  # (epoch second, local YYYYmmddHHMMSS)
+        self._nos_template = None
+        self._nos_template_version = None
+        self._order_senders = {}  # tag schema -> sender from compile_order_sender()
+        self._session_obj = None  # fix.Session looked up in onLogon, valid until onLogout
+        self._session_obj_sid = None
+        if config is not None:
+            self.apply_session_config(config)
         
     def setup_logging(self):
-        logging.basicConfig(
-            filename='sendfix_quickfix.log',
-            level=logging.DEBUG,
-            format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s - %(funcName)s: %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-        )
+        global _log_listener
+        # Same condition under which basicConfig would configure the root logger
+        if not logging.getLogger().handlers:
+            file_handler = logging.FileHandler('sendfix_quickfix.log')
+            file_handler.setFormatter(_CachedTimeFormatter(
+                '%(asctime)s.%(msecs)03d %(levelname)s %(module)s - %(funcName)s: %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S',
+            ))
+            # Callers only enqueue records; the listener thread does the file writes
+            _log_listener = logging.handlers.QueueListener(queue.SimpleQueue(), file_handler)
+            _log_listener.start()
+            atexit.register(_log_listener.stop)
+            queue_handler = logging.handlers.QueueHandler(_log_listener.queue)
+            queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Stop basicConfig applying BASIC_FORMAT
+            # SENDFIX_LOG_LEVEL=INFO drops the per-message *** diagnostics in production
+            level_name = os.environ.get('SENDFIX_LOG_LEVEL', 'DEBUG').upper()
+            level = logging.getLevelName(level_name)
+            valid_level = isinstance(level, int)
+            logging.basicConfig(handlers=[queue_handler], level=level if valid_level else logging.DEBUG)
+            if not valid_level:
+                logging.getLogger(__name__).warning(f"Invalid SENDFIX_LOG_LEVEL {level_name!r}, using DEBUG")
         self.logger = logging.getLogger(__name__)
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
         
     def load_config(self):
-        config = configparser.ConfigParser()
-        config.read('sendfix.cfg')
-        if 'DEFAULT' in config:
-            try:
-                self.HOST = config['DEFAULT']['ServerIP']
-                self.PORT = int(config['DEFAULT']['Port'])
-                self.FIX_VERSION = config['DEFAULT']['FixVersion']
-                self.SENDERCOMPID = config['DEFAULT']['SenderCompId']
-                self.TARGETCOMPID = config['DEFAULT']['TargetCompId']
-                self.HEARTBEAT = int(config['DEFAULT']['HeartbeatInterval'])
-            except Exception as e:
-                raise Exception(f"Invalid configuration: {e}")
+        try:
+            (self.HOST, self.PORT, self.FIX_VERSION, self.SENDERCOMPID,
+             self.TARGETCOMPID, self.HEARTBEAT) = _load_cached('sendfix.cfg', _parse_sendfix_cfg)
+        except Exception as e:
+            raise Exception(f"Invalid configuration: {e}")
                 
+    def apply_session_config(self, config):
+        """Apply a multi_session_config.json session entry instead of sendfix.cfg"""
+        self.HOST = config.get('server_ip', 'localhost')  # Acceptors don't need server_ip
+        self.PORT = config['port']
+        self.FIX_VERSION = config['fix_version']
+        self.SENDERCOMPID = config['sender_comp_id']
+        self.TARGETCOMPID = config['target_comp_id']
+        self.HEARTBEAT = config['heartbeat_interval']
+        if 'quickfix_overrides' in config:
+            self.quickfix_overrides = config['quickfix_overrides']
+            
+    def get_session_settings(self):
+        """Build fix.SessionSettings once and reuse it until the session config or quickfix_defaults.json changes"""
+        try:
+            defaults_mtime = os.stat('quickfix_defaults.json').st_mtime_ns
+        except OSError:
+            defaults_mtime = None  # load_default_config() falls back to built-in defaults
+        key = (self.connection_type, self.HOST, self.PORT, self.FIX_VERSION, self.SENDERCOMPID,
+               self.TARGETCOMPID, self.HEARTBEAT, tuple(sorted((self.quickfix_overrides or {}).items())),
+               defaults_mtime)
+        if self._settings is None or key != self._settings_key:
+            with _cfg_lock:
+                self.create_config_file()
+                self._settings = fix.SessionSettings('quickfix_client.cfg')
+            self._settings_key = key
+        return self._settings
+        
     def log_message(self, message):
         self.logger.info(message)
         if self.message_callback:
-            self.message_callback(message)
+            _dispatch_callback(self.message_callback, message)
+            
+    def debug_message(self, message):
+        """Diagnostic variant of log_message; call under `if self._debug:` so the text is only built when wanted"""
+        self.logger.debug(message)
+        if self.message_callback:
+            _dispatch_callback(self.message_callback, message)
             
     def load_default_config(self):
         """Load default QuickFIX configuration"""
         try:
-            with open('quickfix_defaults.json', 'r') as f:
-                return json.load(f)
+            # Copy so callers can update() it without touching the cached parse
+            return dict(_load_cached('quickfix_defaults.json', _parse_json))
         except:
             # Fallback defaults if file doesn't exist
             return {
@@ -100,38 +350,41 @@ class QuickFixClient(fix.Application):
             self.log_message(f"*** Applying QuickFIX overrides: {self.quickfix_overrides} ***")
             defaults.update(self.quickfix_overrides)
         
-        # Build DEFAULT section
-        default_section = "[DEFAULT]\n"
-        for key, value in defaults.items():
-            default_section += f"{key}={value}\n"
-        
-        # Build SESSION section based on connection type
+        # Build DEFAULT and SESSION sections as one list of lines, joined once
+        lines = ["[DEFAULT]"]
+        lines.extend(f"{key}={value}" for key, value in defaults.items())
+        lines += [
+            "",
+            "[SESSION]",
+            f"BeginString={self.FIX_VERSION}",
+            f"SenderCompID={self.SENDERCOMPID}",
+            f"TargetCompID={self.TARGETCOMPID}",
+        ]
         if self.connection_type == 'acceptor':
-            session_section = f"""\n[SESSION]
-BeginString={self.FIX_VERSION}
-SenderCompID={self.SENDERCOMPID}
-TargetCompID={self.TARGETCOMPID}
-SocketAcceptPort={self.PORT}
-HeartBtInt={self.HEARTBEAT}
-"""
+            lines.append(f"SocketAcceptPort={self.PORT}")
         else:
-            session_section = f"""\n[SESSION]
-BeginString={self.FIX_VERSION}
-SenderCompID={self.SENDERCOMPID}
-TargetCompID={self.TARGETCOMPID}
-SocketConnectPort={self.PORT}
-SocketConnectHost={self.HOST}
-HeartBtInt={self.HEARTBEAT}
-"""
+            lines.append(f"SocketConnectPort={self.PORT}")
+            lines.append(f"SocketConnectHost={self.HOST}")
+        lines.append(f"HeartBtInt={self.HEARTBEAT}")
+        lines.append("")
         
-        config_content = default_section + session_section
+        config_content = "\n".join(lines)
         
         # Log the configuration being used
         self.log_message(f"Creating QuickFIX config: {self.SENDERCOMPID}->{self.TARGETCOMPID} at {self.HOST}:{self.PORT}")
         self.log_message(f"Heartbeat interval: {self.HEARTBEAT} seconds")
         
+        # Skip the rewrite when the file still holds exactly what we last wrote
+        global _last_written_cfg
+        try:
+            mtime = os.stat('quickfix_client.cfg').st_mtime_ns
+        except OSError:
+            mtime = None
+        if _last_written_cfg == (config_content, mtime):
+            return
         with open('quickfix_client.cfg', 'w') as f:
             f.write(config_content)
+        _last_written_cfg = (config_content, os.stat('quickfix_client.cfg').st_mtime_ns)
             
     def connect(self):
         try:
@@ -142,10 +395,13 @@ HeartBtInt={self.HEARTBEAT}
             # CRITICAL: Ensure clean state before connecting
             self.session_id = None
             self.logged_on = False
+            self._connected = False
             self.running = False
             self.connection_failed = False
+            self._session_obj = None
+            self._session_obj_sid = None
             
-            self.create_config_file()
+            settings = self.get_session_settings()
             
             # Create directories if they don't exist
             os.makedirs('store', exist_ok=True)
@@ -159,21 +415,16 @@ HeartBtInt={self.HEARTBEAT}
             ]
             
             for store_file in store_files:
-                if os.path.exists(store_file):
-                    self.log_message(f"*** Found existing store file: {store_file} ***")
-                    try:
-                        with open(store_file, 'r') as f:
-                            content = f.read()
-                            self.log_message(f"*** Store content: {content[:100]}... ***")
-                    except:
-                        pass
-                else:
+                try:
+                    size = os.stat(store_file).st_size
+                except OSError:
                     self.log_message(f"*** Store file not found: {store_file} ***")
+                else:
+                    self.log_message(f"*** Found existing store file: {store_file} ({size} bytes) ***")
             
             # CRITICAL: Create fresh QuickFIX objects for each connection
             self.log_message(f"*** CREATING FRESH QUICKFIX OBJECTS ***")
-            settings = fix.SessionSettings('quickfix_client.cfg')
-            store_factory = fix.FileStoreFactory(settings)
+            store_factory = self.STORE_FACTORY(settings)
             log_factory = fix.FileLogFactory(settings)
             
             if self.connection_type == 'acceptor':
@@ -184,31 +435,17 @@ HeartBtInt={self.HEARTBEAT}
                 self.running = True
                 self.log_message(f"*** ACCEPTOR: Started successfully, listening on port {self.PORT} ***")
                 self.log_message(f"*** ACCEPTOR: Ready to accept connections from {self.TARGETCOMPID} ***")
-                
-                # Check if port is actually bound
-                import socket
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    result = sock.connect_ex(('localhost', self.PORT))
-                    sock.close()
-                    if result == 0:
-                        self.log_message(f"*** ACCEPTOR: Port {self.PORT} is OPEN and accepting connections ***")
-                    else:
-                        self.log_message(f"*** ACCEPTOR: Port {self.PORT} connection test failed (code: {result}) ***")
-                except Exception as e:
-                    self.log_message(f"*** ACCEPTOR: Port check error: {e} ***")
+                # No self-probe of the port: start() raises if the bind fails
             else:
                 # CRITICAL: Force cleanup of old initiator
                 if hasattr(self, 'initiator'):
                     self.log_message(f"*** DESTROYING OLD INITIATOR ***")
                     try:
                         self.initiator.stop()
-                        time.sleep(0.2)
                     except:
                         pass
+                    # stop() has already released the C++ side; del drops the last Python reference
                     del self.initiator
-                    import gc
-                    gc.collect()
                     
                 self.log_message(f"*** CREATING FRESH INITIATOR ***")
                 self.initiator = fix.SocketInitiator(self, store_factory, settings, log_factory)
@@ -239,8 +476,9 @@ HeartBtInt={self.HEARTBEAT}
             if self.session_id and self.logged_on:
                 self.log_message(f"*** FORCING LOGOUT BEFORE DISCONNECT: {self.session_id} ***")
                 try:
+                    self._logout_event.clear()
                     fix.Session.logout(self.session_id)
-                    time.sleep(0.5)  # Allow logout to complete
+                    self._logout_event.wait(timeout=0.5)  # Returns as soon as onLogout fires
                 except Exception as e:
                     self.log_message(f"*** LOGOUT ERROR: {e} ***")
             
@@ -251,22 +489,22 @@ HeartBtInt={self.HEARTBEAT}
                 del self.acceptor
             elif hasattr(self, 'initiator') and self.running:
                 self.log_message("*** INITIATOR: Stopping initiator ***")
-                self.initiator.stop()
-                time.sleep(0.5)  # Allow stop to complete
+                self.initiator.stop()  # Blocks until the initiator thread has stopped
                 del self.initiator
                 
             self.running = False
             self.logged_on = False
+            self._connected = False
             self.logon_count = 0  # Reset logon counter
+            # The engine is stopped, so the cached Session must not outlive it
+            self._session_obj = None
+            self._session_obj_sid = None
             
             # CRITICAL: Clear session_id on disconnect to prevent stale references
             if self.session_id:
                 self.log_message(f"*** CLEARING SESSION_ID: {self.session_id} ***")
                 self.session_id = None
                 
-            # CRITICAL: Force cleanup of QuickFIX internal state
-            import gc
-            gc.collect()
             self.log_message(f"*** DISCONNECT COMPLETE - QuickFIX state cleared ***")
         except Exception as e:
             self.log_message(f"Disconnect error: {e}")
@@ -281,6 +519,7 @@ HeartBtInt={self.HEARTBEAT}
         
         # CRITICAL: Reset all state for fresh session
         self.logged_on = False
+        self._connected = False
         self.connection_failed = False
         self.logon_count = 0
         
@@ -297,23 +536,25 @@ HeartBtInt={self.HEARTBEAT}
         # CRITICAL: Set session_id ONLY on successful logon - this is the ONLY valid session
         old_session_id = self.session_id
         self.session_id = sessionID
+        self._connected = True
         
-        self.log_message(f"*** SESSION LIFECYCLE: onLogon() called for {sessionID} ***")
-        self.log_message(f"*** SESSION ID SET ON LOGON: {old_session_id} -> {sessionID} ***")
-        self.log_message(f"*** THIS IS THE ONLY VALID SESSION FOR ORDERS ***")
-        self.log_message(f"*** SESSION STATE: logged_on={self.logged_on}, running={self.running} ***")
-        self.log_message(f"*** LOGON SESSION OBJECT ID: {id(sessionID)} ***")
-        self.log_message(f"*** CLIENT OBJECT ID AT LOGON: {id(self)} ***")
-        
-        # Give QuickFIX time to fully initialize the session
-        time.sleep(0.2)  # Allow QuickFIX internal state to sync
+        if self._debug:
+            self.debug_message(f"*** SESSION LIFECYCLE: onLogon() called for {sessionID} ***")
+            self.debug_message(f"*** SESSION ID SET ON LOGON: {old_session_id} -> {sessionID} ***")
+            self.debug_message(f"*** THIS IS THE ONLY VALID SESSION FOR ORDERS ***")
+            self.debug_message(f"*** SESSION STATE: logged_on={self.logged_on}, running={self.running} ***")
+            self.debug_message(f"*** LOGON SESSION OBJECT ID: {id(sessionID)} ***")
+            self.debug_message(f"*** CLIENT OBJECT ID AT LOGON: {id(self)} ***")
         
         # Verify session exists in registry (but don't trust isLoggedOn check)
         try:
             session = fix.Session.lookupSession(sessionID)
+            self._session_obj = session
+            self._session_obj_sid = sessionID
             if session:
-                self.log_message(f"*** SUCCESS: Session found in QuickFIX registry ***")
-                self.log_message(f"*** TRUSTING onLogon() CALLBACK - session is ready for orders ***")
+                if self._debug:
+                    self.debug_message(f"*** SUCCESS: Session found in QuickFIX registry ***")
+                    self.debug_message(f"*** TRUSTING onLogon() CALLBACK - session is ready for orders ***")
             else:
                 self.log_message(f"*** ERROR: Session not found in QuickFIX registry ***")
         except Exception as e:
@@ -321,72 +562,83 @@ HeartBtInt={self.HEARTBEAT}
         
         self.log_message(f"Logon successful: {sessionID}")
         
-        if hasattr(self, 'session_callback'):
+        if self.session_callback:
             self.session_callback('connected', sessionID)
         
     def onLogout(self, sessionID):
         self.logged_on = False
-        self.log_message(f"*** SESSION LIFECYCLE: onLogout() called for {sessionID} ***")
-        self.log_message(f"*** SESSION STATE: logged_on={self.logged_on}, running={self.running} ***")
+        self._connected = False
+        self._session_obj = None
+        self._session_obj_sid = None
+        self._logout_event.set()
+        if self._debug:
+            self.debug_message(f"*** SESSION LIFECYCLE: onLogout() called for {sessionID} ***")
+            self.debug_message(f"*** SESSION STATE: logged_on={self.logged_on}, running={self.running} ***")
         
         # CRITICAL: Clear session_id on logout to prevent stale references
         if self.session_id:
-            self.log_message(f"*** CLEARING SESSION_ID ON LOGOUT: {self.session_id} ***")
+            if self._debug:
+                self.debug_message(f"*** CLEARING SESSION_ID ON LOGOUT: {self.session_id} ***")
             self.session_id = None
-        else:
-            self.log_message(f"*** SESSION_ID ALREADY CLEARED ***")
+        elif self._debug:
+            self.debug_message(f"*** SESSION_ID ALREADY CLEARED ***")
         
         # CRITICAL: Reset logon counter for fresh reconnection
         self.logon_count = 0
-        self.log_message(f"*** RESET LOGON COUNTER FOR FRESH RECONNECTION ***")
+        if self._debug:
+            self.debug_message(f"*** RESET LOGON COUNTER FOR FRESH RECONNECTION ***")
         
         # Check if this is an immediate logout after logon (connection rejected)
         if hasattr(self, 'logon_time'):
             logout_time = time.time()
             duration = logout_time - self.logon_time
-            self.log_message(f"*** SESSION DURATION: {duration:.2f} seconds ***")
+            if self._debug:
+                self.debug_message(f"*** SESSION DURATION: {duration:.2f} seconds ***")
             if duration < 2:  # Less than 2 seconds
                 self.log_message(f"*** IMMEDIATE LOGOUT DETECTED - Connection rejected by server ***")
                 self.log_message(f"*** Possible causes: Invalid credentials, session not configured on server, or heartbeat mismatch ***")
         
         # Check if initiator is trying to reconnect
         if hasattr(self, 'initiator') and self.running:
-            self.log_message(f"*** INITIATOR STATUS: Still running, may attempt reconnect ***")
+            if self._debug:
+                self.debug_message(f"*** INITIATOR STATUS: Still running, may attempt reconnect ***")
         
         self.log_message(f"Logout: {sessionID} - Session disconnected by counterparty")
         
-        if hasattr(self, 'session_callback'):
+        if self.session_callback:
             self.session_callback('disconnected', sessionID)
         
     def toAdmin(self, message, sessionID):
-        msg_type_field = fix.MsgType()
-        message.getHeader().getField(msg_type_field)
-        msg_type = msg_type_field.getValue()
+        msg_type = _msg_type_of(message)
         
         # Handle ResetSeqNumFlag in logon messages
         if msg_type == 'A':  # Logon
             try:
                 # Check if we have an override for ResetSeqNumFlag
-                if hasattr(self, 'quickfix_overrides') and 'ResetSeqNumFlag' in self.quickfix_overrides:
+                if 'ResetSeqNumFlag' in self.quickfix_overrides:
                     reset_flag = self.quickfix_overrides['ResetSeqNumFlag']
                     if reset_flag == 'Y':
                         message.setField(141, 'Y')
-                        self.log_message(f"*** ADDED Tag 141=Y to logon message (CLI override) ***")
+                        if self._debug:
+                            self.debug_message(f"*** ADDED Tag 141=Y to logon message (CLI override) ***")
                     else:
                         if message.isSetField(141):
                             message.removeField(141)
-                            self.log_message(f"*** REMOVED Tag 141 from logon message ***")
+                            if self._debug:
+                                self.debug_message(f"*** REMOVED Tag 141 from logon message ***")
                 else:
                     # Default behavior - remove ResetSeqNumFlag
                     if message.isSetField(141):
                         message.removeField(141)
-                        self.log_message(f"*** REMOVED Tag 141 from logon message ***")
+                        if self._debug:
+                            self.debug_message(f"*** REMOVED Tag 141 from logon message ***")
             except Exception as e:
                 self.log_message(f"*** ERROR handling ResetSeqNumFlag: {e} ***")
                 
             if hasattr(self, 'logon_count'):
                 self.logon_count += 1
-                self.log_message(f"*** LOGON ATTEMPT #{self.logon_count} ***")
+                if self._debug:
+                    self.debug_message(f"*** LOGON ATTEMPT #{self.logon_count} ***")
                 if self.logon_count > 1:
                     self.log_message(f"*** WARNING: Multiple logon attempts detected ***")
                     self.log_message(f"*** Connection #{self.connection_count} - Logon attempt #{self.logon_count} ***")
@@ -404,36 +656,27 @@ HeartBtInt={self.HEARTBEAT}
                         self.log_message(f"*** Error checking session: {e} ***")
             else:
                 self.logon_count = 1
-                self.log_message(f"*** FIRST LOGON ATTEMPT ***")
-                self.log_message(f"*** CONNECTION #{self.connection_count} - FRESH LOGON ***")
+                if self._debug:
+                    self.debug_message(f"*** FIRST LOGON ATTEMPT ***")
+                    self.debug_message(f"*** CONNECTION #{self.connection_count} - FRESH LOGON ***")
         elif msg_type == '0':  # Heartbeat
-            self.log_message(f"*** HEARTBEAT SENT - Session appears active ***")
-            # Verify session is still valid during heartbeat
-            try:
-                if self.session_id:
-                    session_obj = fix.Session.lookupSession(self.session_id)
-                    if not session_obj:
-                        self.log_message(f"*** CRITICAL: Session lost during heartbeat - {self.session_id} ***")
-                        self.logged_on = False
-                        self.session_id = None
-            except Exception as e:
-                self.log_message(f"*** Heartbeat session check error: {e} ***")
+            if self._debug:
+                self.debug_message(f"*** HEARTBEAT SENT - Session appears active ***")
                 
         self.log_message(f"Sent Admin ({msg_type}): {self.format_message(message)}")
         
     def fromAdmin(self, message, sessionID):
-        msg_type_field = fix.MsgType()
-        message.getHeader().getField(msg_type_field)
-        msg_type = msg_type_field.getValue()
+        msg_type = _msg_type_of(message)
         
         # Handle different admin message types
         if msg_type == '3':  # Reject
             self.connection_failed = True
             self.logged_on = False
+            self._connected = False
             self.log_message(f"*** REJECT RECEIVED - Connection failed ***")
             # Get reject reason if available
             try:
-                text_field = fix.Text()
+                text_field = _text_field()
                 if message.isSetField(text_field):
                     message.getField(text_field)
                     self.log_message(f"*** Reject reason: {text_field.getValue()} ***")
@@ -444,55 +687,107 @@ HeartBtInt={self.HEARTBEAT}
         elif msg_type == '4':  # SequenceReset
             self.log_message(f"*** SEQUENCE RESET - Adjusting sequence numbers ***")
         elif msg_type == '0':  # Heartbeat
-            self.log_message(f"*** HEARTBEAT RECEIVED - Session active ***")
-            # Confirm session is still valid on heartbeat receipt
-            try:
-                if self.session_id:
-                    session_obj = fix.Session.lookupSession(self.session_id)
-                    if session_obj:
-                        self.log_message(f"*** HEARTBEAT CONFIRMS: Session {self.session_id} still valid ***")
-                    else:
-                        self.log_message(f"*** HEARTBEAT WARNING: Session {self.session_id} not found ***")
-            except Exception as e:
-                self.log_message(f"*** Heartbeat validation error: {e} ***")
+            # Liveness is tracked by timestamp; logon/logout callbacks own the session state
+            self.last_heartbeat_recv_time = time.monotonic()
+            if self._debug:
+                self.debug_message(f"*** HEARTBEAT RECEIVED - Session active ***")
         elif msg_type == '5':  # Logout
             self.log_message(f"*** LOGOUT MESSAGE RECEIVED ***")
             
         self.log_message(f"Received Admin ({msg_type}): {self.format_message(message)}")
         
     def toApp(self, message, sessionID):
-        msg_type_field = fix.MsgType()
-        message.getHeader().getField(msg_type_field)
-        msg_type = msg_type_field.getValue()
+        msg_type = _msg_type_of(message)
         msg_desc = self.get_message_type_description(msg_type)
         self.log_message(f"Sent {msg_desc}: {self.format_message(message)}")
         
     def fromApp(self, message, sessionID):
-        msg_type_field = fix.MsgType()
-        message.getHeader().getField(msg_type_field)
-        msg_type = msg_type_field.getValue()
+        msg_type = _msg_type_of(message)
         msg_desc = self.get_message_type_description(msg_type)
         formatted_msg = self.format_message(message)
         self.log_message(f"Received {msg_desc}: {formatted_msg}")
         
         # Handle execution reports for GUI
-        if msg_type == fix.MsgType_ExecutionReport and hasattr(self, 'gui_callback') and self.gui_callback:
-            self.gui_callback(formatted_msg)
+        if msg_type == _EXECREPORT_CODE and self.gui_callback is not None:
+            # Same ordered queue as message_callback, which is often the same handler
+            _dispatch_callback(self.gui_callback, formatted_msg)
             
+    def lookup_session(self, session_id):
+        """fix.Session for session_id, reusing the one cached at logon while that SessionID is current"""
+        session = self._session_obj
+        if session is not None and session_id is self._session_obj_sid:
+            return session
+        # e.g. a SessionID built by hand for sequence changes before any logon
+        return fix.Session.lookupSession(session_id)
+        
+    def transact_time_field(self):
+        """fix.TransactTime for the current second; FIX 4.2 TransactTime is second precision"""
+        now = int(time.time())
+        cached = self._transact_time
+        if cached[0] != now:
+            cached = self._transact_time = (now, fix.TransactTime())
+        return cached[1]
+        
+    def begin_string_field(self):
+        """fix.BeginString for FIX_VERSION, built once per version"""
+        return _begin_string(self.FIX_VERSION)
+        
+    def new_order_message(self):
+        """Copy of a prebuilt NewOrderSingle that already carries BeginString, MsgType and HandlInst"""
+        if self._nos_template is None or self._nos_template_version != self.FIX_VERSION:
+            template = fix.Message()
+            header = template.getHeader()
+            header.setField(self.begin_string_field())
+            header.setField(_MSGTYPE_NOS)
+            template.setField(_HANDLINST_AUTO)
+            self._nos_template = template
+            self._nos_template_version = self.FIX_VERSION
+        return fix.Message(self._nos_template)
+        
+    def compile_order_sender(self, tag_schema):
+        """Return send(symbol, side, quantity, tag_values, price=None, order_type='1', tif='0')
+        for callers that always send the same custom tags, in tag_schema order.
+        
+        Header/body routing is resolved once here instead of parsing custom_tags per order.
+        """
+        key = tuple(int(tag) for tag in tag_schema)
+        sender = self._order_senders.get(key)
+        if sender is None:
+            setters = tuple(_order_tag_setter(tag) for tag in key)
+            
+            def sender(symbol, side, quantity, tag_values, price=None, order_type='1', tif='0'):
+                if len(tag_values) != len(setters):
+                    raise ValueError(f"Expected {len(setters)} tag values for {key}, got {len(tag_values)}")
+                return self._send_new_order(symbol, side, quantity, price, order_type, tif,
+                                            None, zip(setters, tag_values))
+            self._order_senders[key] = sender
+        return sender
+        
     def send_new_order_single(self, symbol, side, quantity, price=None, order_type='1', tif='0', custom_tags=None):
         """Send New Order Single with proper header field handling"""
+        return self._send_new_order(symbol, side, quantity, price, order_type, tif, custom_tags, None)
+        
+    def _send_new_order(self, symbol, side, quantity, price, order_type, tif, custom_tags, tag_plan):
+        """Shared body of send_new_order_single and compiled senders; tag_plan is pre-resolved (setter, value) pairs"""
         try:
-            if not self.session_id:
+            # Read session state once; it is only written by the QuickFIX callbacks
+            session_id = self.session_id
+            logged_on = self.logged_on
+            running = self.running
+            debug = self._debug
+            if not session_id:
                 self.log_message("No active session")
                 return False, None
                 
-            message = fix.Message()
+            # Trust only our internal state - ignore QuickFIX isLoggedOn() due to stale session_id issues
+            if not (logged_on and running):
+                self.log_message(f"*** PRE-SEND ERROR: Session not ready (logged_on={logged_on}, running={running}) ***")
+                return False, None
+                
+            # BeginString, MsgType and HandlInst come from the template
+            message = self.new_order_message()
             header = message.getHeader()
             
-            # Header
-            header.setField(fix.BeginString(self.FIX_VERSION))
-            header.setField(fix.MsgType(fix.MsgType_NewOrderSingle))
-            
             # Generate ClOrdID
             clordid = self.generate_clordid()
             message.setField(fix.ClOrdID(clordid))
@@ -501,15 +796,18 @@ HeartBtInt={self.HEARTBEAT}
             message.setField(fix.OrderQty(int(quantity)))
             message.setField(fix.OrdType(order_type))
             message.setField(fix.TimeInForce(tif))
-            message.setField(fix.HandlInst('1'))
-            message.setField(fix.TransactTime())  # Tag 60
+            message.setField(self.transact_time_field())  # Tag 60
             
             # Price for limit orders
             if price and order_type == '2':
                 message.setField(fix.Price(float(price)))
                 
             # Add custom tags with proper header field handling
-            if custom_tags:
+            if tag_plan is not None:
+                # Pre-resolved by compile_order_sender()
+                for setter, value in tag_plan:
+                    setter(message, header, value)
+            elif custom_tags:
                 for tag_value in custom_tags.split('|'):
                     if '=' in tag_value:
                         tag, value = tag_value.split('=', 1)
@@ -518,33 +816,31 @@ HeartBtInt={self.HEARTBEAT}
                         # Set routing fields in header for proper FIX routing
                         if tag_int == 50:  # SenderSubID - header field for routing
                             header.setField(fix.SenderSubID(value))
-                            self.log_message(f"Set SenderSubID (Tag 50) in header: {value}")
+                            if debug:
+                                self.debug_message(f"Set SenderSubID (Tag 50) in header: {value}")
                         elif tag_int == 115:  # OnBehalfOfCompID - header field for routing
                             header.setField(fix.OnBehalfOfCompID(value))
-                            self.log_message(f"Set OnBehalfOfCompID (Tag 115) in header: {value}")
+                            if debug:
+                                self.debug_message(f"Set OnBehalfOfCompID (Tag 115) in header: {value}")
                         else:
                             # Other tags go in message body
                             message.setField(tag_int, value)
                         
-            # Trust only our internal state - ignore QuickFIX isLoggedOn() due to stale session_id issues
-            if not (self.logged_on and self.running):
-                self.log_message(f"*** PRE-SEND ERROR: Session not ready (logged_on={self.logged_on}, running={self.running}) ***")
-                return False, None
-                
             # CRITICAL: Double-check session is still valid before sending
             try:
-                session_obj = fix.Session.lookupSession(self.session_id)
+                session_obj = self.lookup_session(session_id)
                 if not session_obj:
-                    self.log_message(f"*** CRITICAL ERROR: Session {self.session_id} not found in QuickFIX registry ***")
+                    self.log_message(f"*** CRITICAL ERROR: Session {session_id} not found in QuickFIX registry ***")
                     self.log_message(f"*** This indicates a stale session - forcing reconnection ***")
                     self.logged_on = False
+                    self._connected = False
                     self.session_id = None
                     return False, None
                     
                 # Additional check: verify session is actually connected to network
                 if not session_obj.isLoggedOn():
                     self.log_message(f"*** CRITICAL ERROR: QuickFIX session shows not logged on ***")
-                    self.log_message(f"*** Session state mismatch - our logged_on={self.logged_on}, QuickFIX={session_obj.isLoggedOn()} ***")
+                    self.log_message(f"*** Session state mismatch - our logged_on={logged_on}, QuickFIX={session_obj.isLoggedOn()} ***")
                     # Don't fail here - trust our callback, but log the discrepancy
                     
             except Exception as e:
@@ -552,14 +848,16 @@ HeartBtInt={self.HEARTBEAT}
                 return False, None
             
             # CRITICAL: Use the EXACT SessionID object from logon - do NOT create fresh one
-            self.log_message(f"*** USING LOGON SESSION_ID: {self.session_id} ***")
-            self.log_message(f"*** LOGON SESSION OBJECT ID: {id(self.session_id)} ***")
-            self.log_message(f"*** CLIENT OBJECT ID AT SEND: {id(self)} ***")
-            self.log_message(f"*** QUICKFIX SESSION OBJECT ID: {id(session_obj)} ***")
-            self.log_message(f"*** PROCEEDING WITH ORDER SEND ***")
+            if debug:
+                self.debug_message(f"*** USING LOGON SESSION_ID: {session_id} ***")
+                self.debug_message(f"*** LOGON SESSION OBJECT ID: {id(session_id)} ***")
+                self.debug_message(f"*** CLIENT OBJECT ID AT SEND: {id(self)} ***")
+                self.debug_message(f"*** QUICKFIX SESSION OBJECT ID: {id(session_obj)} ***")
+                self.debug_message(f"*** PROCEEDING WITH ORDER SEND ***")
             
-            result = fix.Session.sendToTarget(message, self.session_id)
-            self.log_message(f"*** SEND RESULT: sendToTarget returned {result} ***")
+            result = fix.Session.sendToTarget(message, session_id)
+            if debug:
+                self.debug_message(f"*** SEND RESULT: sendToTarget returned {result} ***")
             
             if not result:
                 self.log_message(f"*** SEND FAILED: sendToTarget returned False - message not transmitted ***")
@@ -570,6 +868,57 @@ HeartBtInt={self.HEARTBEAT}
             self.log_message(f"Error sending order: {e}")
             return False, None
             
+    def send_new_order_list(self, orders):
+        """Send several orders as one NewOrderList (35=E) with a NoOrders group per order
+        
+        Each order is a dict with symbol, side, quantity and optional price, order_type, tif.
+        Returns (success, list_id, clordids).
+        """
+        try:
+            if not self.session_id:
+                self.log_message("No active session")
+                return False, None, []
+            if not (self.logged_on and self.running):
+                self.log_message(f"*** PRE-SEND ERROR: Session not ready (logged_on={self.logged_on}, running={self.running}) ***")
+                return False, None, []
+            
+            message = fix.Message()
+            header = message.getHeader()
+            header.setField(self.begin_string_field())
+            header.setField(_MSGTYPE_NOL)
+            
+            list_id = self.generate_clordid()
+            message.setField(fix.ListID(list_id))
+            message.setField(fix.BidType(3))  # No bidding process
+            message.setField(fix.TotNoOrders(len(orders)))
+            
+            clordids = []
+            for seq, order in enumerate(orders, 1):
+                order_type = order.get('order_type', '1')
+                clordid = self.generate_clordid()
+                group = fix.Group(fix.NoOrders().getField(), fix.ClOrdID().getField())
+                group.setField(fix.ClOrdID(clordid))
+                group.setField(fix.ListSeqNo(seq))
+                group.setField(_HANDLINST_AUTO)
+                group.setField(fix.Symbol(order['symbol']))
+                group.setField(fix.Side(order['side']))
+                group.setField(fix.OrderQty(int(order['quantity'])))
+                group.setField(fix.OrdType(order_type))
+                group.setField(fix.TimeInForce(order.get('tif', '0')))
+                if order.get('price') and order_type == '2':
+                    group.setField(fix.Price(float(order['price'])))
+                message.addGroup(group)
+                clordids.append(clordid)
+            
+            if not fix.Session.sendToTarget(message, self.session_id):
+                self.log_message(f"*** SEND FAILED: sendToTarget returned False - order list not transmitted ***")
+                return False, None, []
+            self.log_message(f"Sent NewOrderList {list_id} with {len(clordids)} orders")
+            return True, list_id, clordids
+        except Exception as e:
+            self.log_message(f"Error sending order list: {e}")
+            return False, None, []
+    
     def send_order_cancel_request(self, orig_clordid, symbol, side, quantity):
         """Send Order Cancel Request"""
         try:
@@ -580,15 +929,15 @@ HeartBtInt={self.HEARTBEAT}
             message = fix.Message()
             header = message.getHeader()
             
-            header.setField(fix.BeginString(self.FIX_VERSION))
-            header.setField(fix.MsgType(fix.MsgType_OrderCancelRequest))
+            header.setField(self.begin_string_field())
+            header.setField(_MSGTYPE_OCR)
             
             message.setField(fix.ClOrdID(self.generate_clordid()))
             message.setField(fix.OrigClOrdID(orig_clordid))
             message.setField(fix.Symbol(symbol))
             message.setField(fix.Side(side))
             message.setField(fix.OrderQty(int(quantity)))
-            message.setField(fix.TransactTime())  # Tag 60
+            message.setField(self.transact_time_field())  # Tag 60
             
             fix.Session.sendToTarget(message, self.session_id)
             return True
@@ -606,8 +955,8 @@ HeartBtInt={self.HEARTBEAT}
             message = fix.Message()
             header = message.getHeader()
             
-            header.setField(fix.BeginString(self.FIX_VERSION))
-            header.setField(fix.MsgType(fix.MsgType_OrderCancelReplaceRequest))
+            header.setField(self.begin_string_field())
+            header.setField(_MSGTYPE_OCRR)
             
             message.setField(fix.ClOrdID(self.generate_clordid()))
             message.setField(fix.OrigClOrdID(orig_clordid))
@@ -616,8 +965,8 @@ HeartBtInt={self.HEARTBEAT}
             message.setField(fix.OrderQty(int(quantity)))
             message.setField(fix.OrdType(order_type))
             message.setField(fix.TimeInForce(tif))
-            message.setField(fix.HandlInst('1'))
-            message.setField(fix.TransactTime())  # Tag 60
+            message.setField(_HANDLINST_AUTO)
+            message.setField(self.transact_time_field())  # Tag 60
             
             if price and order_type == '2':
                 message.setField(fix.Price(float(price)))
@@ -635,32 +984,21 @@ HeartBtInt={self.HEARTBEAT}
                 self.log_message("No active session")
                 return False
                 
-            pairs = raw_fix.split("|")
             message = fix.Message()
             header = message.getHeader()
             
             msg_type = None
-            for pair in pairs:
-                if '=' in pair:
-                    tag, value = pair.split('=', 1)
+            # partition() splits each field in one C call without building a list per pair
+            for tag, sep, value in map(str.partition, raw_fix.split("|"), repeat('=')):
+                if sep:
                     tag_int = int(tag)
                     
-                    if tag_int == 35:  # MsgType - required
-                        msg_type = value
-                        header.setField(fix.MsgType(value))
-                    elif tag_int == 8:  # BeginString - let QuickFIX handle
-                        continue
-                    elif tag_int in [9, 10, 34, 52]:  # Skip auto-generated fields
-                        continue
-                    elif tag_int == 49:  # SenderCompID - optional override
-                        header.setField(fix.SenderCompID(value))
-                    elif tag_int == 56:  # TargetCompID - optional override
-                        header.setField(fix.TargetCompID(value))
-                    elif tag_int == 50:  # SenderSubID - header field for routing
-                        header.setField(fix.SenderSubID(value))
-                    elif tag_int == 115:  # OnBehalfOfCompID - header field for routing
-                        header.setField(fix.OnBehalfOfCompID(value))
-                    else:
+                    header_field = _RAW_HEADER_FIELDS.get(tag_int)
+                    if header_field is not None:
+                        header.setField(header_field(value))
+                        if tag_int == 35:  # MsgType - required
+                            msg_type = value
+                    elif tag_int not in _RAW_SKIP_TAGS:
                         message.setField(tag_int, value)
                         
             if msg_type:
@@ -686,18 +1024,18 @@ HeartBtInt={self.HEARTBEAT}
             
             msg_type = None
             for pair in pairs:
-                if '=' in pair:
-                    tag, value = pair.split('=', 1)
-                    tag_int = int(tag)
+                # One find() locates the separator; slicing avoids the membership test plus split()
+                eq = pair.find('=')
+                if eq >= 0:
+                    tag_int = int(pair[:eq])
+                    value = pair[eq + 1:]
                     
-                    if tag_int == 35:  # MsgType
-                        msg_type = value
-                        header.setField(fix.MsgType(value))
-                    elif tag_int == 8:  # BeginString
-                        header.setField(fix.BeginString(value))
-                    elif tag_int in [49, 56, 34, 52]:  # Skip header fields
-                        continue
-                    else:
+                    header_field = _CUSTOM_HEADER_FIELDS.get(tag_int)
+                    if header_field is not None:
+                        header.setField(header_field(value))
+                        if tag_int == 35:  # MsgType
+                            msg_type = value
+                    elif tag_int not in _CUSTOM_SKIP_TAGS:
                         message.setField(tag_int, value)
                         
             if msg_type:
@@ -710,154 +1048,127 @@ HeartBtInt={self.HEARTBEAT}
             self.log_message(f"Error sending custom message: {e}")
             return False
             
-    def send_orders_from_file(self, filename='fix_orders.txt'):
-        """Send orders from file"""
+    def send_orders_from_file(self, filename='fix_orders.txt', send_interval=0.0):
+        """Send orders from file, at most one every send_interval seconds when set; True if all were sent
+
+        Leave send_interval at 0 unless the venue throttles order entry; pacing
+        should follow that throttle rather than a blanket sleep.
+        """
         try:
-            with open(filename, 'r') as f:
-                lines = f.readlines()
-                
-            header = lines[0].strip().split('|')
-            self.log_message(f"Processing {len(lines) - 1} orders from {filename}")
-            
-            for i, line in enumerate(lines[1:], 1):
-                if not line.strip():
-                    continue
-                    
-                values = line.strip().split('|')
-                message = fix.Message()
-                msg_header = message.getHeader()
-                
-                msg_header.setField(fix.BeginString(self.FIX_VERSION))
-                msg_header.setField(fix.MsgType(fix.MsgType_NewOrderSingle))
-                
-                message.setField(fix.ClOrdID(self.generate_clordid()))
-                message.setField(fix.HandlInst('1'))
-                
-                # Map file data to FIX tags
-                for tag, value in zip(header, values):
-                    if value:
-                        tag_int = int(tag)
-                        if tag_int == 48:  # SecurityID
-                            message.setField(fix.SecurityID(value))
-                            message.setField(fix.Symbol(value))
-                        else:
-                            message.setField(tag_int, value)
-                            
-                # Add TransactTime for all orders
-                message.setField(fix.TransactTime())  # Tag 60
-                            
-                fix.Session.sendToTarget(message, self.session_id)
-                clord_id = message.getField(fix.ClOrdID())
-                self.log_message(f"Sent NewOrderSingle #{i} (ClOrdID={clord_id})")
-                time.sleep(0.1)
+            with open(filename, 'r', buffering=1 << 16) as f:
+                # Header tags are parsed once; rows are streamed rather than read up front
+                tags, keep = parse_order_header(next(f))
+                self.log_message(f"Processing orders from {filename}")
                 
-            self.log_message(f"Completed sending {len(lines) - 1} orders")
+                rows = (zip(tags, compress(line.split('|'), keep)) for line in map(str.strip, f) if line)
+                self._send_order_rows(rows, send_interval)
+            return True
         except Exception as e:
             self.log_message(f"Error processing orders file: {e}")
+            return False
             
+    def send_orders_from_batch(self, orders, send_interval=0.0):
+        """Send NewOrderSingles built from {int tag: value} dicts, with the same defaults
+        (ClOrdID, HandlInst, TransactTime, 48 -> Symbol) as send_orders_from_file; True if all were sent
+        """
+        try:
+            self.log_message("Processing orders from batch")
+            self._send_order_rows((order.items() for order in orders), send_interval)
+            return True
+        except Exception as e:
+            self.log_message(f"Error processing order batch: {e}")
+            return False
+            
+    def _send_order_rows(self, rows, send_interval):
+        """Send one order per iterable of (tag, value) pairs, pacing and logging as it goes; raises if a send fails"""
+        # Per-order log lines are handed to log_message in batches, not one call per order
+        sent_logs = []
+        count = 0
+        # Bound once; these run for every order
+        send_order = self._send_order_fields
+        log_sent = sent_logs.append
+        try:
+            next_send = time.monotonic()
+            for i, fields in enumerate(rows, 1):
+                clord_id = send_order(fields)
+                log_sent(f"Sent NewOrderSingle #{i} (ClOrdID={clord_id})")
+                
+                if send_interval > 0:
+                    # Paced runs are slow anyway; flush while waiting so progress stays visible
+                    self.log_message("\n".join(sent_logs))
+                    sent_logs.clear()
+                    next_send += send_interval
+                    delay = next_send - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                elif len(sent_logs) >= _SENT_LOG_BATCH:
+                    # Bound memory and keep progress visible on large unpaced files
+                    self.log_message("\n".join(sent_logs))
+                    sent_logs.clear()
+                        
+                count += 1
+        finally:
+            if sent_logs:
+                self.log_message("\n".join(sent_logs))
+                
+        self.log_message(f"Completed sending {count} orders")
+        
+    def _send_order_fields(self, fields, clord_id=None):
+        """Build a NewOrderSingle from (int tag, value) pairs and send it; returns the ClOrdID"""
+        if clord_id is None:
+            clord_id = self.generate_clordid()
+        message = self.new_order_message()
+        set_field = message.setField
+        set_field(fix.ClOrdID(clord_id))
+        
+        # Map order data to FIX tags
+        for tag_int, value in fields:
+            if value:
+                if tag_int == 48:  # SecurityID
+                    set_field(fix.SecurityID(value))
+                    set_field(fix.Symbol(value))
+                else:
+                    set_field(tag_int, value)
+                    
+        # Add TransactTime for all orders
+        set_field(self.transact_time_field())  # Tag 60
+        
+        if not fix.Session.sendToTarget(message, self.session_id):
+            raise RuntimeError(f"sendToTarget failed for ClOrdID {clord_id}")
+        return clord_id
+        
     def generate_clordid(self):
         self.order_counter += 1
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"{timestamp}{self.order_counter:04d}"
+        now = int(time.time())
+        cached = self._clordid_prefix
+        if cached[0] != now:
+            cached = self._clordid_prefix = (now, time.strftime("%Y%m%d%H%M%S", time.localtime(now)))
+        return f"{cached[1]}{self.order_counter:04d}"
         
     def format_message(self, message):
         """Format QuickFIX message for display"""
         try:
-            formatted_pairs = []
-            
-            # Get header fields including routing fields
-            header = message.getHeader()
-            for field_tag in [8, 9, 35, 49, 56, 50, 115, 34, 52]:
-                try:
-                    if field_tag == 8:
-                        field = fix.BeginString()
-                        header.getField(field)
-                        formatted_pairs.append(f"{field_tag}={field.getValue()}")
-                    elif field_tag == 35:
-                        field = fix.MsgType()
-                        header.getField(field)
-                        formatted_pairs.append(f"{field_tag}={field.getValue()}")
-                    elif field_tag == 49:
-                        field = fix.SenderCompID()
-                        header.getField(field)
-                        formatted_pairs.append(f"{field_tag}={field.getValue()}")
-                    elif field_tag == 56:
-                        field = fix.TargetCompID()
-                        header.getField(field)
-                        formatted_pairs.append(f"{field_tag}={field.getValue()}")
-                    elif field_tag == 50:
-                        field = fix.SenderSubID()
-                        header.getField(field)
-                        formatted_pairs.append(f"{field_tag}={field.getValue()}")
-                    elif field_tag == 115:
-                        field = fix.OnBehalfOfCompID()
-                        header.getField(field)
-                        formatted_pairs.append(f"{field_tag}={field.getValue()}")
-                    elif field_tag == 34:
-                        field = fix.MsgSeqNum()
-                        header.getField(field)
-                        formatted_pairs.append(f"{field_tag}={field.getValue()}")
-                    elif field_tag == 52:
-                        field = fix.SendingTime()
-                        header.getField(field)
-                        formatted_pairs.append(f"{field_tag}={field.getValue()}")
-                except:
-                    pass
-                    
-            # Get body fields
-            iterator = message.iterator()
-            while iterator.hasNext():
-                field = iterator.next()
-                tag = field.getTag()
-                value = field.getValue()
-                formatted_pairs.append(f"{tag}={value}")
-                
-            # Get trailer fields
-            trailer = message.getTrailer()
-            try:
-                checksum_field = fix.CheckSum()
-                trailer.getField(checksum_field)
-                formatted_pairs.append(f"10={checksum_field.getValue()}")
-            except:
-                pass
-                
-            return "|".join(formatted_pairs)
+            # One C++ call renders header, body (including groups) and trailer in wire order
+            return message.toString().replace('\x01', '|').rstrip('|')
         except Exception as e:
             return str(message)
             
-    def get_message_type_description(self, msg_type):
+    @staticmethod
+    def get_message_type_description(msg_type):
         """Get human-readable description for message type"""
-        msg_types = {
-            '0': 'Heartbeat',
-            '1': 'TestRequest',
-            '2': 'ResendRequest',
-            '3': 'Reject',
-            '4': 'SequenceReset',
-            '5': 'Logout',
-            'A': 'Logon',
-            'D': 'NewOrderSingle',
-            'F': 'OrderCancelRequest',
-            'G': 'OrderCancelReplaceRequest',
-            '8': 'ExecutionReport',
-            '9': 'OrderCancelReject'
-        }
-        return msg_types.get(msg_type, f'MsgType({msg_type})')
+        return _MSGTYPE_DESC.get(msg_type) or f'MsgType({msg_type})'
         
     def is_connected(self):
-        """Check if session is connected - trust our onLogon callback over QuickFIX isLoggedOn"""
-        if not self.running:
-            return False
-            
+        """Check if session is connected - trust our onLogon callback over QuickFIX isLoggedOn
+        
+        Cheap enough to poll, but GUIs should not poll faster than every ~200 ms.
+        """
         # For acceptors, running=True means listening (ready)
         if self.connection_type == 'acceptor':
             return self.running  # Acceptor is "connected" when listening
             
-        # For initiators, need actual logon
-        if not self.session_id:
-            return False
-            
-        # Trust our logged_on flag from onLogon callback - QuickFIX isLoggedOn() has timing issues
-        return self.logged_on and self.running
+        # For initiators, set in onLogon and cleared wherever logged_on/session_id are reset
+        return self._connected
         
     def send_sequence_reset(self, new_seq_num, gap_fill=False):
         """Send sequence reset message"""
@@ -869,14 +1180,11 @@ HeartBtInt={self.HEARTBEAT}
             message = fix.Message()
             header = message.getHeader()
             
-            header.setField(fix.BeginString(self.FIX_VERSION))
-            header.setField(fix.MsgType(fix.MsgType_SequenceReset))
+            header.setField(self.begin_string_field())
+            header.setField(_MSGTYPE_SEQRESET)
             
             message.setField(fix.NewSeqNo(int(new_seq_num)))
-            if gap_fill:
-                message.setField(fix.GapFillFlag('Y'))
-            else:
-                message.setField(fix.GapFillFlag('N'))
+            message.setField(_gap_fill_flag('Y' if gap_fill else 'N'))
                 
             fix.Session.sendToTarget(message, self.session_id)
             self.log_message(f"Sent SequenceReset: NewSeqNo={new_seq_num}, GapFill={gap_fill}")
@@ -891,10 +1199,12 @@ HeartBtInt={self.HEARTBEAT}
             if not self.session_id:
                 return None, None
                 
-            next_sender_seq = fix.Session.getExpectedSenderNum(self.session_id)
-            next_target_seq = fix.Session.getExpectedTargetNum(self.session_id)
-            
-            return next_sender_seq, next_target_seq
+            # Polled by the GUI; reuses the Session cached at logon rather than a registry lookup per tick
+            session = self.lookup_session(self.session_id)
+            if not session:
+                return None, None
+                
+            return session.getExpectedSenderNum(), session.getExpectedTargetNum()
         except Exception as e:
             self.log_message(f"Error getting sequence numbers: {e}")
             return None, None
@@ -906,10 +1216,11 @@ HeartBtInt={self.HEARTBEAT}
                 self.log_message("No active session for setting sender sequence")
                 return False
                 
-            self.log_message(f"DEBUG: session_id type: {type(self.session_id)}, value: {self.session_id}")
+            if self._debug:
+                self.debug_message(f"DEBUG: session_id type: {type(self.session_id)}, value: {self.session_id}")
             
             # Use the correct QuickFIX API method
-            session = fix.Session.lookupSession(self.session_id)
+            session = self.lookup_session(self.session_id)
             if session:
                 session.setNextSenderMsgSeqNum(int(seq_num))
                 self.log_message(f"Set next sender sequence number to: {seq_num}")
@@ -928,10 +1239,11 @@ HeartBtInt={self.HEARTBEAT}
                 self.log_message("No active session for setting target sequence")
                 return False
                 
-            self.log_message(f"DEBUG: session_id type: {type(self.session_id)}, value: {self.session_id}")
+            if self._debug:
+                self.debug_message(f"DEBUG: session_id type: {type(self.session_id)}, value: {self.session_id}")
             
             # Use the correct QuickFIX API method
-            session = fix.Session.lookupSession(self.session_id)
+            session = self.lookup_session(self.session_id)
             if session:
                 session.setNextTargetMsgSeqNum(int(seq_num))
                 self.log_message(f"Set next target sequence number to: {seq_num}")
@@ -1,43 +1,166 @@
 #!/usr/bin/env python3
 
 import argparse
+import csv
 import json
+import os
+import queue
+import re
+import selectors
 import sys
+import threading
 import time
-from datetime import datetime
+from collections import deque
+from contextlib import contextmanager
+from itertools import compress
 from multi_fix_client import MultiFixClient
-from quickfix_client import QuickFixClient
+from quickfix_client import QuickFixClient, parse_order_header, wait_for_callbacks
+
+MESSAGE_LOG_LIMIT = 10_000
+OUTPUT_FLUSH_LINES = 64
+OUTPUT_FLUSH_INTERVAL = 0.1  # Seconds
+BULK_QUEUE_SIZE = 1024  # Parsed orders the bulk reader may run ahead of the sender
+
+# Lenient session_id: tolerates spaces around ':' and '->' (e.g. pasted from logs)
+_SID_RE = re.compile(r'^\s*(FIXT?\.\d\.\d)\s*:\s*(.+?)\s*->\s*(.+?)\s*$')
 
 class SendFixCLI:
     def __init__(self):
         self.multi_client = None
-        self.message_log = []
+        self.message_log = deque(maxlen=MESSAGE_LOG_LIMIT)  # Bounded for long shell/scheduler runs
+        self._log_second = (None, '')  # (epoch second, HH:MM:SS) for log_message
+        # One-shot commands block-buffer stdout (see buffer_output); log_message flushes in batches
+        self._buffered = False
+        self._unflushed = 0
+        self._last_flush = 0.0
+        # session_id / name lookups over client.session_configs, see index_sessions()
+        self._indexed_configs = None
+        self._session_ids = ()  # (session_id, config) per config, in file order
+        self._sid_to_name = {}
+        self._name_to_config = {}
+        self._triple_to_name = {}  # (fix_version, sender, target) -> name
+        self._logon_events = {}  # session name -> threading.Event set by session_callback on logon
+        # interactive_shell command -> handler(parts, line)
+        self._cmds = {
+            'help': lambda parts, line: self.show_help(),
+            'login': self._cmd_login,
+            'list': lambda parts, line: self.list_sessions(),
+            'order': self._cmd_order,
+            'bulk': self._cmd_bulk,
+            'raw': self._cmd_raw,
+            'disconnect': self._cmd_disconnect,
+        }
+        # While the shell waits at its prompt, log lines from other threads queue here instead of
+        # printing over the prompt; the shell prints them between polls of stdin
+        self._shell_pending = None
+        self._shell_idle = False
+        # Scheduler jobs collect their log lines instead of printing them, see capture_output()
+        self._capture = threading.local()
+        self._captures = ()
+        self._captures_lock = threading.Lock()
         
     def log_message(self, message):
         """Log messages to console and internal log"""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        log_entry = f"[{timestamp}] {message}"
-        print(log_entry)
+        # HH:MM:SS is formatted once per second; only the milliseconds change between lines
+        now = time.time()
+        second = int(now)
+        cached = self._log_second
+        if cached[0] != second:
+            cached = self._log_second = (second, time.strftime('%H:%M:%S', time.localtime(second)))
+        log_entry = f"[{cached[1]}.{int((now - second) * 1000):03d}] {message}"
+        captured = getattr(self._capture, 'lines', None)
+        if captured is not None:
+            captured.append(log_entry)
+        elif self._captures:
+            # From a QuickFIX callback thread: it can't be tied to one job, so every running job gets it
+            for lines in self._captures:
+                lines.append(log_entry)
+        elif self._shell_idle:
+            self._shell_pending.put(log_entry)
+        else:
+            print(log_entry)
+            if self._buffered:
+                self._unflushed += 1
+                if self._unflushed >= OUTPUT_FLUSH_LINES or now - self._last_flush > OUTPUT_FLUSH_INTERVAL:
+                    self.flush_output()
         self.message_log.append(log_entry)
         
+    @contextmanager
+    def capture_output(self):
+        """Collect the calling thread's log lines, plus those from QuickFIX callback threads, into a list"""
+        lines = []
+        self._capture.lines = lines
+        with self._captures_lock:
+            self._captures += (lines,)
+        try:
+            yield lines
+        finally:
+            # Session messages the command triggered may still be queued for delivery
+            wait_for_callbacks()
+            self._capture.lines = None
+            with self._captures_lock:
+                self._captures = tuple(c for c in self._captures if c is not lines)
+                
+    def buffer_output(self, enabled=True):
+        """Block-buffer stdout so bursts of log lines share one write; the shell keeps line buffering"""
+        sys.stdout.flush()
+        try:
+            sys.stdout.reconfigure(line_buffering=not enabled)
+        except AttributeError:
+            return  # stdout replaced, e.g. by redirect_stdout in the scheduler
+        self._buffered = enabled
+        
+    def flush_output(self):
+        """Write out buffered log lines"""
+        sys.stdout.flush()
+        self._unflushed = 0
+        self._last_flush = time.time()
+        
     def session_callback(self, state, session_id):
         """Handle session state changes"""
         self.log_message(f"Session {session_id} -> {state}")
+        if state == 'connected' and self._logon_events:
+            event = self._logon_events.get(self._sid_to_name.get(session_id))
+            if event is not None:
+                event.set()
+            else:
+                # session_id not in the index (e.g. qualified); wake every waiter to re-check its own session
+                for event in list(self._logon_events.values()):
+                    event.set()
         
+    def index_sessions(self, client):
+        """Build the session_id -> name and name -> config dicts, again only if the client reloaded its configs"""
+        configs = client.session_configs
+        if configs is not self._indexed_configs:
+            # Each session_id string is built once here; the configs themselves are left untouched
+            self._session_ids = tuple(
+                (f"{config['fix_version']}:{config['sender_comp_id']}->{config['target_comp_id']}", config)
+                for config in configs
+            )
+            # reversed() so the first config with a given id or name wins, as the old scans did
+            self._sid_to_name = {sid: config['name'] for sid, config in reversed(self._session_ids)}
+            self._name_to_config = {config['name']: config for config in reversed(configs)}
+            self._triple_to_name = {
+                (config['fix_version'], config['sender_comp_id'], config['target_comp_id']): config['name']
+                for config in reversed(configs)
+            }
+            self._indexed_configs = configs
+            
     def get_session_name_from_id(self, client, session_id):
         """Convert session_id format to session name"""
-        for config in client.session_configs:
-            config_session_id = f"{config['fix_version']}:{config['sender_comp_id']}->{config['target_comp_id']}"
-            if config_session_id == session_id:
-                return config['name']
+        self.index_sessions(client)
+        name = self._sid_to_name.get(session_id)
+        if name is not None:
+            return name
         # If not found by ID, maybe it's already a name
-        for config in client.session_configs:
-            if config['name'] == session_id:
-                return config['name']
-        return None
+        if session_id in self._name_to_config:
+            return session_id
+        # Last, a session_id written with different spacing
+        match = _SID_RE.match(session_id)
+        return self._triple_to_name.get(match.groups()) if match else None
         
     def init_client(self):
-        """Initialize multi-client with proper config loading"""
+        """Initialize multi-client with proper config loading; main() and the shell call this up front"""
         if not self.multi_client:
             self.multi_client = MultiFixClient(
                 message_callback=self.log_message,
@@ -45,6 +168,7 @@ class SendFixCLI:
             )
             # Configuration is loaded automatically in __init__
             self.log_message(f"*** CLI: Loaded {len(self.multi_client.session_configs)} session configs ***")
+            self.index_sessions(self.multi_client)
         return self.multi_client
         
     def login_session(self, session_id, reset_seq=False, wait_timeout=30):
@@ -58,33 +182,16 @@ class SendFixCLI:
         """
         self.log_message(f"*** CLI LOGIN: Attempting to login to {session_id} ***")
         
-        client = self.init_client()
+        client = self.multi_client or self.init_client()
         
         # Find session config by session_id format or session name
-        session_config = None
-        session_name = None
-        
-        # Try to match by session_id format first
-        for config in client.session_configs:
-            config_session_id = f"{config['fix_version']}:{config['sender_comp_id']}->{config['target_comp_id']}"
-            if config_session_id == session_id:
-                session_config = config
-                session_name = config['name']
-                break
-                
-        # If not found, try to match by session name
-        if not session_config:
-            for config in client.session_configs:
-                if config['name'] == session_id:
-                    session_config = config
-                    session_name = config['name']
-                    break
-                
+        session_name = self.get_session_name_from_id(client, session_id)
+        session_config = self._name_to_config.get(session_name) if session_name else None
+        
         if not session_config:
             self.log_message(f"*** CLI ERROR: Session {session_id} not found in configuration ***")
             self.log_message(f"*** Available sessions: ***")
-            for config in client.session_configs:
-                config_id = f"{config['fix_version']}:{config['sender_comp_id']}->{config['target_comp_id']}"
+            for config_id, config in self._session_ids:
                 self.log_message(f"  {config_id} ({config['name']})")
             return False
             
@@ -112,33 +219,43 @@ class SendFixCLI:
             else:
                 client.sessions[session_id].quickfix_overrides = {"ResetSeqNumFlag": "Y"}
         
-        # Connect to session using session name
-        success, message = client.connect_session(session_name)
-        
-        if not success:
-            self.log_message(f"*** CLI LOGIN: Failed to connect - {message} ***")
-            return False
+        # Registered before connecting so a fast Logon cannot be missed
+        logon_event = self._logon_events[session_name] = threading.Event()
+        try:
+            # Connect to session using session name
+            success, message = client.connect_session(session_name)
+            
+            if not success:
+                self.log_message(f"*** CLI LOGIN: Failed to connect - {message} ***")
+                return False
+                
+            # Wait for logon confirmation; session_callback wakes us instead of polling
+            self.log_message(f"*** CLI LOGIN: Waiting up to {wait_timeout}s for logon confirmation ***")
+            deadline = time.monotonic() + wait_timeout
             
-        # Wait for logon confirmation
-        self.log_message(f"*** CLI LOGIN: Waiting up to {wait_timeout}s for logon confirmation ***")
-        start_time = time.time()
-        
-        while time.time() - start_time < wait_timeout:
-            if session_name in client.sessions:
-                session_client = client.sessions[session_name]
-                if session_client.is_connected():
+            while True:
+                session_client = client.sessions.get(session_name)
+                if session_client is not None and session_client.is_connected():
                     self.log_message(f"*** CLI LOGIN: Successfully logged on to {session_id} ***")
                     return True
-            time.sleep(0.5)
-            
-        self.log_message(f"*** CLI LOGIN: Timeout waiting for logon to {session_id} ***")
-        return False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if self._buffered:
+                    self.flush_output()  # Show progress before blocking
+                logon_event.wait(remaining)
+                logon_event.clear()
+                
+            self.log_message(f"*** CLI LOGIN: Timeout waiting for logon to {session_id} ***")
+            return False
+        finally:
+            self._logon_events.pop(session_name, None)
         
     def send_order(self, session_id, symbol, side, quantity, order_type, price=None, **kwargs):
         """Send FIX NewOrderSingle order"""
         self.log_message(f"*** CLI ORDER: Sending {side} {quantity} {symbol} @ {price or 'MKT'} ***")
         
-        client = self.init_client()
+        client = self.multi_client or self.init_client()
         
         session_name = self.get_session_name_from_id(client, session_id)
         if not session_name or session_name not in client.sessions:
@@ -151,19 +268,6 @@ class SendFixCLI:
             return False
             
         try:
-            order_data = {
-                'symbol': symbol,
-                'side': side,
-                'quantity': quantity,
-                'order_type': order_type
-            }
-            
-            if price:
-                order_data['price'] = price
-                
-            for key, value in kwargs.items():
-                order_data[key] = value
-                
             success, clordid = session_client.send_new_order_single(
                 symbol=symbol,
                 side=side,
@@ -184,7 +288,7 @@ class SendFixCLI:
         """Send bulk orders from file"""
         self.log_message(f"*** CLI BULK ORDERS: Processing {filename} for {session_id} ***")
         
-        client = self.init_client()
+        client = self.multi_client or self.init_client()
         
         session_name = self.get_session_name_from_id(client, session_id)
         if not session_name or session_name not in client.sessions:
@@ -197,18 +301,61 @@ class SendFixCLI:
             return False
             
         try:
-            session_client.send_orders_from_file(filename)
+            # Stream rows into the batch send path; the file is never held in memory
+            with open(filename, 'r', newline='', buffering=1 << 20) as f:
+                tags, keep = parse_order_header(next(f))
+                lines = (line for line in map(str.strip, f) if line)
+                rows = csv.reader(lines, delimiter='|', quoting=csv.QUOTE_NONE)
+                sent = self._pipeline_orders(session_client, tags, keep, rows)
+            if not sent:
+                self.log_message(f"*** CLI ERROR: Bulk orders from {filename} were not all sent ***")
+                return False
             self.log_message(f"*** CLI BULK ORDERS: Completed processing {filename} ***")
             return True
         except Exception as e:
             self.log_message(f"*** CLI ERROR: Failed to process bulk orders - {e} ***")
             return False
             
+    def _pipeline_orders(self, session_client, tags, keep, rows):
+        """Parse rows on a reader thread while this thread sends, so file reads overlap socket writes;
+        returns send_orders_from_batch's result
+        """
+        orders = queue.Queue(maxsize=BULK_QUEUE_SIZE)
+        stop = threading.Event()
+        errors = []
+        
+        def read_orders():
+            try:
+                for row in rows:
+                    if stop.is_set():
+                        break
+                    orders.put(dict(zip(tags, compress(row, keep))))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                orders.put(None)
+                
+        reader = threading.Thread(target=read_orders, name='bulk-order-reader', daemon=True)
+        reader.start()
+        try:
+            sent = session_client.send_orders_from_batch(iter(orders.get, None))
+        finally:
+            # If sending stopped early, unblock the reader so the file can be closed
+            stop.set()
+            while reader.is_alive():
+                try:
+                    orders.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+        if errors:
+            raise errors[0]
+        return sent
+            
     def send_raw_fix(self, session_id, raw_fix):
         """Send raw FIX message"""
         self.log_message(f"*** CLI RAW FIX: Sending to {session_id} ***")
         
-        client = self.init_client()
+        client = self.multi_client or self.init_client()
         
         session_name = self.get_session_name_from_id(client, session_id)
         if not session_name or session_name not in client.sessions:
@@ -233,18 +380,18 @@ class SendFixCLI:
         
     def list_sessions(self):
         """List all available sessions"""
-        client = self.init_client()
+        client = self.multi_client or self.init_client()
         
+        self.index_sessions(client)
         self.log_message("*** CLI SESSIONS: Available sessions ***")
-        for config in client.session_configs:
-            session_id = f"{config['fix_version']}:{config['sender_comp_id']}->{config['target_comp_id']}"
+        for session_id, config in self._session_ids:
             connected = client.is_session_connected(config['name'])
             status = "CONNECTED" if connected else "DISCONNECTED"
             self.log_message(f"  {session_id} ({config['name']}) - {status}")
             
     def disconnect_session(self, session_id):
         """Disconnect from session"""
-        client = self.init_client()
+        client = self.multi_client or self.init_client()
         session_name = self.get_session_name_from_id(client, session_id)
         if session_name:
             client.disconnect_session(session_name)
@@ -254,12 +401,75 @@ class SendFixCLI:
             
     def interactive_shell(self):
         """Interactive shell mode for continuous commands"""
+        if self._buffered:
+            self.buffer_output(False)  # Immediate echo at the prompt
         self.log_message("*** CLI SHELL: Starting interactive mode ***")
         self.log_message("*** Type 'help' for commands, 'exit' to quit ***")
+        self.init_client()  # Once up front so commands find the client already built
+        
+        self._shell_pending = queue.SimpleQueue()
+        self._stdin_buffer = b''
+        try:
+            selector = selectors.DefaultSelector()
+            selector.register(sys.stdin, selectors.EVENT_READ)
+        except (OSError, ValueError):
+            # stdin is a regular file or not selectable on this platform; fall back to input()
+            selector = None
+            
+        try:
+            self._shell_loop(selector)
+        finally:
+            if selector is not None:
+                selector.close()
+            self._shell_idle = False
+            self._flush_shell_pending()
+            self._shell_pending = None
+            
+    def _read_command(self, selector):
+        """Prompt and read one line, printing queued session output while waiting
+        
+        stdin is read with os.read into our own buffer: sys.stdin.readline() can pull several
+        pasted lines into its buffer, where select() no longer sees them and the shell stalls.
+        """
+        if selector is None:
+            return input("sendfix> ")
+            
+        print("sendfix> ", end='', flush=True)
+        fd = sys.stdin.fileno()
+        while b'\n' not in self._stdin_buffer:
+            self._shell_idle = True
+            try:
+                while not selector.select(timeout=0.05):
+                    if self._flush_shell_pending(leading='\n'):
+                        print("sendfix> ", end='', flush=True)
+            finally:
+                self._shell_idle = False
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                if not self._stdin_buffer:
+                    raise EOFError
+                break  # Last line had no newline
+            self._stdin_buffer += chunk
+        self._flush_shell_pending()
+        
+        line, _, self._stdin_buffer = self._stdin_buffer.partition(b'\n')
+        return line.decode(sys.stdin.encoding or 'utf-8', errors='replace')
         
+    def _flush_shell_pending(self, leading=''):
+        """Print log lines queued while the shell was idle; returns True if any were printed"""
+        pending = self._shell_pending
+        if pending is None or pending.empty():
+            return False
+        lines = []
+        while not pending.empty():
+            lines.append(pending.get())
+        print(leading + "\n".join(lines), flush=True)
+        return True
+        
+    def _shell_loop(self, selector):
         while True:
             try:
-                command = input("sendfix> ").strip()
+                command = self._read_command(selector).strip()
                 if not command:
                     continue
                     
@@ -269,45 +479,10 @@ class SendFixCLI:
                 if cmd == 'exit' or cmd == 'quit':
                     self.log_message("*** CLI SHELL: Exiting ***")
                     break
-                elif cmd == 'help':
-                    self.show_help()
-                elif cmd == 'login':
-                    if len(parts) < 2:
-                        print("Usage: login <session_id> [--reset-seq]")
-                        continue
-                    session_id = parts[1]
-                    reset_seq = '--reset-seq' in parts
-                    self.login_session(session_id, reset_seq)
-                elif cmd == 'list':
-                    self.list_sessions()
-                elif cmd == 'order':
-                    if len(parts) < 6:
-                        print("Usage: order <session_id> <symbol> <side> <quantity> <type> [price]")
-                        continue
-                    session_id = parts[1]
-                    symbol = parts[2]
-                    side = parts[3]
-                    quantity = parts[4]
-                    order_type = parts[5]
-                    price = parts[6] if len(parts) > 6 else None
-                    self.send_order(session_id, symbol, side, quantity, order_type, price)
-                elif cmd == 'bulk':
-                    if len(parts) < 3:
-                        print("Usage: bulk <session_id> <filename>")
-                        continue
-                    self.send_bulk_orders(parts[1], parts[2])
-                elif cmd == 'raw':
-                    if len(parts) < 3:
-                        print("Usage: raw <session_id> <fix_message>")
-                        continue
-                    session_id = parts[1]
-                    message = ' '.join(parts[2:])
-                    self.send_raw_fix(session_id, message)
-                elif cmd == 'disconnect':
-                    if len(parts) < 2:
-                        print("Usage: disconnect <session_id>")
-                        continue
-                    self.disconnect_session(parts[1])
+                    
+                handler = self._cmds.get(cmd)
+                if handler is not None:
+                    handler(parts, command)
                 else:
                     print(f"Unknown command: {cmd}. Type 'help' for available commands.")
                     
@@ -320,6 +495,38 @@ class SendFixCLI:
             except Exception as e:
                 self.log_message(f"*** CLI ERROR: {e} ***")
                 
+    def _cmd_login(self, parts, line):
+        if len(parts) < 2:
+            print("Usage: login <session_id> [--reset-seq]")
+            return
+        self.login_session(parts[1], '--reset-seq' in parts)
+        
+    def _cmd_order(self, parts, line):
+        if len(parts) < 6:
+            print("Usage: order <session_id> <symbol> <side> <quantity> <type> [price]")
+            return
+        price = parts[6] if len(parts) > 6 else None
+        self.send_order(parts[1], parts[2], parts[3], parts[4], parts[5], price)
+        
+    def _cmd_bulk(self, parts, line):
+        if len(parts) < 3:
+            print("Usage: bulk <session_id> <filename>")
+            return
+        self.send_bulk_orders(parts[1], parts[2])
+        
+    def _cmd_raw(self, parts, line):
+        if len(parts) < 3:
+            print("Usage: raw <session_id> <fix_message>")
+            return
+        # Take the message from the line itself so its spacing survives
+        self.send_raw_fix(parts[1], line.split(None, 2)[2])
+        
+    def _cmd_disconnect(self, parts, line):
+        if len(parts) < 2:
+            print("Usage: disconnect <session_id>")
+            return
+        self.disconnect_session(parts[1])
+        
     def show_help(self):
         """Show available commands"""
         print("\nAvailable commands:")
@@ -333,6 +540,12 @@ class SendFixCLI:
         print("  exit                              - Exit shell")
         print()
 
+def _run_login(args, cli):
+    success = cli.login_session(args.session_id, args.reset_seq, args.timeout)
+    if success and args.shell:
+        cli.interactive_shell()
+    return success
+
 def main():
     parser = argparse.ArgumentParser(description='SendFix CLI - Backend FIX Operations')
     
@@ -347,6 +560,7 @@ def main():
     login_parser.add_argument('--reset-seq', action='store_true', help='Add ResetSeqNumFlag=Y to logon')
     login_parser.add_argument('--timeout', type=int, default=30, help='Logon timeout in seconds')
     login_parser.add_argument('--shell', action='store_true', help='Enter shell mode after login')
+    login_parser.set_defaults(func=_run_login)
     
     # Send order command
     order_parser = subparsers.add_parser('send-order', help='Send FIX order')
@@ -356,23 +570,30 @@ def main():
     order_parser.add_argument('quantity', help='Order quantity')
     order_parser.add_argument('order_type', help='Order type (1=Market, 2=Limit)')
     order_parser.add_argument('--price', help='Order price (for limit orders)')
+    order_parser.set_defaults(func=lambda a, c: c.send_order(a.session_id, a.symbol, a.side,
+                                                             a.quantity, a.order_type, a.price))
     
     # Bulk orders command
     bulk_parser = subparsers.add_parser('bulk-orders', help='Send bulk orders from file')
     bulk_parser.add_argument('session_id', help='Session ID')
     bulk_parser.add_argument('filename', help='Orders file path')
+    bulk_parser.set_defaults(func=lambda a, c: c.send_bulk_orders(a.session_id, a.filename))
     
     # Raw FIX command
     raw_parser = subparsers.add_parser('raw-fix', help='Send raw FIX message')
     raw_parser.add_argument('session_id', help='Session ID')
     raw_parser.add_argument('message', help='Raw FIX message (pipe separated)')
+    raw_parser.set_defaults(func=lambda a, c: c.send_raw_fix(a.session_id, a.message))
     
     # List sessions command
-    subparsers.add_parser('list-sessions', help='List all available sessions')
+    # Commands whose func returns None exit 0; the others exit 0/1 on their result
+    subparsers.add_parser('list-sessions', help='List all available sessions').set_defaults(
+        func=lambda a, c: c.list_sessions())
     
     # Disconnect command
     disc_parser = subparsers.add_parser('disconnect', help='Disconnect from session')
     disc_parser.add_argument('session_id', help='Session ID')
+    disc_parser.set_defaults(func=lambda a, c: c.disconnect_session(a.session_id))
     
     args = parser.parse_args()
     
@@ -388,31 +609,11 @@ def main():
         return
         
     try:
-        if args.command == 'login':
-            success = cli.login_session(args.session_id, args.reset_seq, args.timeout)
-            if success and args.shell:
-                cli.interactive_shell()
-            sys.exit(0 if success else 1)
-            
-        elif args.command == 'send-order':
-            success = cli.send_order(args.session_id, args.symbol, args.side, 
-                                   args.quantity, args.order_type, args.price)
-            sys.exit(0 if success else 1)
-            
-        elif args.command == 'bulk-orders':
-            success = cli.send_bulk_orders(args.session_id, args.filename)
-            sys.exit(0 if success else 1)
-            
-        elif args.command == 'raw-fix':
-            success = cli.send_raw_fix(args.session_id, args.message)
-            sys.exit(0 if success else 1)
-            
-        elif args.command == 'list-sessions':
-            cli.list_sessions()
-            
-        elif args.command == 'disconnect':
-            cli.disconnect_session(args.session_id)
-            
+        cli.buffer_output()
+        cli.init_client()
+        result = args.func(args, cli)
+        if result is not None:
+            sys.exit(0 if result else 1)
     except Exception as e:
         print(f"*** CLI ERROR: {e} ***")
         sys.exit(1)
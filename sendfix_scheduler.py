@@ -1,16 +1,55 @@
 #!/usr/bin/env python3
 
+import hashlib
 import json
 import time
 import schedule
 import subprocess
+import sys
+import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+try:
+    import orjson  # Optional; faster config load/save
+except ImportError:
+    orjson = None
+
+# Jobs run against one long-lived SendFixCLI: command -> call taking (cli, args after the command)
+_IN_PROCESS_COMMANDS = {
+    'login': lambda cli, args: cli.login_session(args[0], '--reset-seq' in args[1:]),
+    'bulk-orders': lambda cli, args: cli.send_bulk_orders(args[0], args[1]),
+    'raw-fix': lambda cli, args: cli.send_raw_fix(args[0], args[1]),
+}
+
+# Subprocess fallback: this interpreter and the CLI next to this file, resolved once
+_CLI_COMMAND = [sys.executable, str(Path(__file__).resolve().with_name('sendfix_cli.py'))]
+
+JOB_WORKERS = 8
+DUPLICATE_BULK_WINDOW = 300  # Seconds; the same orders file resent to a session within this is skipped
+
+def _file_digest(path):
+    """blake2b of a file, read in chunks so a large orders file is never held in memory"""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 class SendFixScheduler:
-    def __init__(self, config_file='scheduler_config.json'):
+    def __init__(self, config_file='scheduler_config.json', in_process=True):
         self.config_file = config_file
+        self.in_process = in_process  # False: spawn sendfix_cli.py per job as before
+        self.cli = None
+        self._cli_lock = threading.Lock()
+        # Jobs run on a pool so jobs due at the same time start together; jobs for the
+        # same session still run one at a time, in the order they were due
+        self.pool = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='sendfix-job')
+        self._session_locks = {}  # session config name -> Lock, see _session_key()
+        self._timers = {}  # job name -> threading.Timer for interval jobs
+        self._stopping = False
+        self._bulk_sent = {}  # (session key, file digest) -> monotonic time the bulk job succeeded
         self.setup_logging()
         self.load_config()
         
@@ -27,8 +66,8 @@ class SendFixScheduler:
     def load_config(self):
         """Load scheduler configuration"""
         try:
-            with open(self.config_file, 'r') as f:
-                self.config = json.load(f)
+            data = Path(self.config_file).read_bytes()
+            self.config = orjson.loads(data) if orjson else json.loads(data)
             self.logger.info(f"Loaded scheduler config from {self.config_file}")
         except FileNotFoundError:
             # Create default config
@@ -48,13 +87,18 @@ class SendFixScheduler:
             
     def save_config(self):
         """Save scheduler configuration"""
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        if orjson:
+            Path(self.config_file).write_bytes(orjson.dumps(self.config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.config_file, 'w') as f:
+                json.dump(self.config, f, indent=2)
             
     def execute_cli_command(self, command_args):
         """Execute SendFix CLI command"""
+        if self.in_process:
+            return self.execute_in_process(command_args)
         try:
-            cmd = ['python3', 'sendfix_cli.py'] + command_args
+            cmd = _CLI_COMMAND + command_args
             self.logger.info(f"Executing: {' '.join(cmd)}")
             
             result = subprocess.run(
@@ -78,17 +122,107 @@ class SendFixScheduler:
             self.logger.error(f"Error executing command: {e}")
             return False
             
+    def execute_in_process(self, command_args):
+        """Execute a CLI command on the shared SendFixCLI, so sessions stay logged on between jobs"""
+        command = command_args[0]
+        handler = _IN_PROCESS_COMMANDS.get(command)
+        if handler is None:
+            self.logger.error(f"Command failed: unsupported command {command}")
+            return False
+            
+        try:
+            cli = self.get_cli()
+            self.logger.info(f"Executing in process: {' '.join(command_args)}")
+            
+            with cli.capture_output() as lines:
+                success = handler(cli, command_args[1:])
+            output = "\n".join(lines)
+                
+            if success:
+                self.logger.info(f"Command succeeded: {output}")
+                return True
+            else:
+                self.logger.error(f"Command failed: {output}")
+                return False
+        except Exception as e:
+            self.logger.error(f"Error executing command: {e}")
+            return False
+            
+    def get_cli(self):
+        """The shared SendFixCLI, built with its MultiFixClient on first use"""
+        with self._cli_lock:
+            if self.cli is None:
+                from sendfix_cli import SendFixCLI  # Deferred: pulls in quickfix
+                cli = SendFixCLI()
+                cli.init_client()
+                self.cli = cli
+            return self.cli
+            
+    def _session_key(self, session_id):
+        """Config name for session_id, so differently written IDs of one session share a lock"""
+        if not self.in_process:
+            return session_id  # Subprocess jobs don't load the session configs here
+        cli = self.get_cli()
+        return cli.get_session_name_from_id(cli.multi_client, session_id) or session_id
+        
+    def submit_job(self, job, session_id, *args):
+        """Hand a scheduled job to the pool so the scheduler loop never blocks on it"""
+        # setdefault is atomic, so timer threads and the scheduler loop share one lock per session
+        session_lock = self._session_locks.setdefault(self._session_key(session_id), threading.Lock())
+        self.pool.submit(self._run_job, session_lock, job, session_id, *args)
+        
+    def start_interval_job(self, job_name, seconds, job, session_id, *args):
+        """Run job every `seconds` on a self-rescheduling Timer, bypassing schedule's per-second scan"""
+        next_run = time.monotonic() + seconds
+        
+        def fire():
+            nonlocal next_run
+            if self._stopping:
+                return
+            self.submit_job(job, session_id, *args)
+            next_run += seconds
+            arm()
+            
+        def arm():
+            timer = threading.Timer(max(0, next_run - time.monotonic()), fire)
+            timer.daemon = True
+            self._timers[job_name] = timer
+            timer.start()
+            
+        arm()
+        
+    def _run_job(self, session_lock, job, session_id, *args):
+        with session_lock:
+            try:
+                job(session_id, *args)
+            except Exception as e:
+                self.logger.error(f"Job {job.__name__} failed: {e}")
+                
     def job_bulk_orders(self, session_id, filename):
         """Scheduled job: Send bulk orders"""
         self.logger.info(f"Starting bulk orders job: {session_id} -> {filename}")
         
         # Check if file exists
-        if not Path(filename).exists():
+        path = Path(filename)
+        if not path.exists():
             self.logger.error(f"Orders file not found: {filename}")
             return False
+        if not path.is_file() or path.stat().st_size == 0:
+            self.logger.warning(f"Orders file is empty, skipping: {filename}")
+            return False
+            
+        # Jobs for one session run one at a time, so this check-then-record cannot race
+        key = (self._session_key(session_id), _file_digest(path))
+        sent_at = self._bulk_sent.get(key)
+        if sent_at is not None and time.monotonic() - sent_at < DUPLICATE_BULK_WINDOW:
+            self.logger.warning(f"Orders file {filename} already sent to {session_id}, skipping duplicate")
+            return False
             
         # Execute bulk orders command
-        return self.execute_cli_command(['bulk-orders', session_id, filename])
+        success = self.execute_cli_command(['bulk-orders', session_id, filename])
+        if success:
+            self._bulk_sent[key] = time.monotonic()
+        return success
         
     def job_login_session(self, session_id, reset_seq=False):
         """Scheduled job: Login to session"""
@@ -124,6 +258,7 @@ class SendFixScheduler:
             
             if command == 'bulk-orders':
                 schedule.every().day.at(schedule_time).do(
+                    self.submit_job,
                     self.job_bulk_orders,
                     job['session_id'],
                     job['filename']
@@ -131,6 +266,7 @@ class SendFixScheduler:
                 
             elif command == 'login':
                 schedule.every().day.at(schedule_time).do(
+                    self.submit_job,
                     self.job_login_session,
                     job['session_id'],
                     job.get('reset_seq', False)
@@ -140,18 +276,17 @@ class SendFixScheduler:
                 # For heartbeat, schedule_time can be interval like "5m" for every 5 minutes
                 if schedule_time.endswith('m'):
                     minutes = int(schedule_time[:-1])
-                    schedule.every(minutes).minutes.do(
-                        self.job_heartbeat,
-                        job['session_id']
-                    ).tag(job_name)
+                    self.start_interval_job(job_name, minutes * 60, self.job_heartbeat, job['session_id'])
                 else:
                     schedule.every().day.at(schedule_time).do(
+                        self.submit_job,
                         self.job_heartbeat,
                         job['session_id']
                     ).tag(job_name)
                     
             elif command == 'raw-fix':
                 schedule.every().day.at(schedule_time).do(
+                    self.submit_job,
                     self.job_raw_fix,
                     job['session_id'],
                     job['message']
@@ -166,11 +301,22 @@ class SendFixScheduler:
         
         try:
             while True:
+                # Sleep until the earliest job is due rather than waking every second
+                idle = schedule.idle_seconds()
+                if idle is None:
+                    time.sleep(60)  # No jobs scheduled
+                    continue
+                if idle > 0:
+                    time.sleep(idle)
                 schedule.run_pending()
-                time.sleep(1)
         except KeyboardInterrupt:
             self.logger.info("Scheduler stopped by user")
             print("\nScheduler stopped.")
+        finally:
+            self._stopping = True
+            for timer in list(self._timers.values()):
+                timer.cancel()
+            self.pool.shutdown(wait=False, cancel_futures=True)
 
 def main():
     import argparse
@@ -178,6 +324,7 @@ def main():
     parser = argparse.ArgumentParser(description='SendFix Scheduler - Automated FIX Operations')
     parser.add_argument('--config', default='scheduler_config.json', help='Config file path')
     parser.add_argument('--create-sample', action='store_true', help='Create sample config file')
+    parser.add_argument('--subprocess', action='store_true', help='Run each job in a new sendfix_cli.py process')
     
     args = parser.parse_args()
     
@@ -223,7 +370,7 @@ def main():
         print("Sample config created: scheduler_config_sample.json")
         return
         
-    scheduler = SendFixScheduler(args.config)
+    scheduler = SendFixScheduler(args.config, in_process=not args.subprocess)
     scheduler.run()
 
 if __name__ == '__main__':